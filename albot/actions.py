@@ -2,37 +2,66 @@ import abc
 import math
 import random
 import dataclasses
+from typing import Iterator, Optional, Sequence, Tuple
 
 from albot.state import State
 from albot.view import View, Location, STATION_CODE_LOCATIONS
-from albot.planning import PREDECESSORS
+from albot.planning import PREDECESSOR_MASKS, SUCCESSOR_MASKS
+from albot.stations import STATION_BITS, StationSet
 from albot.utils import drive
-from albot.navmesh import get_zone, is_direct_routable, OPTIMAL_CAPTURE_ANGLES
+from albot.kalman import MOTOR_LINEAR_SPEED
+from albot.navmesh import get_zone, is_direct_routable, capture_point, TOWER_RADIUS
 from albot.nerf import NERF_MODE
-from sr.robot import Robot, StationCode, Claimant
+from albot.sweeper import SWEEP_TIMEOUT
+from albot.telemetry import TELEMETRY, STEER, STEER_AHEAD, STEER_LEFT, STEER_RIGHT
+from sr.robot import Robot, StationCode
 
 
+# A running action is only pre-empted by one with a higher priority
+DRIVE_PRIORITY = 0
+AVOID_PRIORITY = 1
+CLAIM_PRIORITY = 2
+
+
+# Actions run a tick at a time, so that sensing and estimation carry on while
+# they do. perform is a generator which does a tick's work up to each yield,
+# handing control back to the main loop until the next tick, and the action
+# is done when it returns. Most actions only need the one tick, and just
+# implement tick.
 class Action(abc.ABC):
-    @abc.abstractmethod
-    def perform(self, robot: Robot, state: State, view: View) -> None:
+    priority = DRIVE_PRIORITY
+
+    def perform(self, robot: Robot, state: State, view: View) -> Iterator[None]:
+        self.tick(robot, state, view)
+        yield from ()
+
+    def tick(self, robot: Robot, state: State, view: View) -> None:
         raise NotImplementedError
 
 
+def wait(robot: Robot, duration: float) -> Iterator[None]:
+    # Yield ticks until the given time has passed, in place of sleeping
+    end = robot.time() + duration
+    while robot.time() < end:
+        yield
+
+
 @dataclasses.dataclass(frozen=True)
 class DoNothing(Action):
-    def perform(self, robot: Robot, state: State, view: View) -> None:
+    def tick(self, robot: Robot, state: State, view: View) -> None:
         drive(robot, 0)
 
 
 @dataclasses.dataclass(frozen=True)
 class MoveRandomly(Action):
-    def perform(self, robot: Robot, state: State, view: View) -> None:
+    priority = AVOID_PRIORITY
+
+    def perform(self, robot: Robot, state: State, view: View) -> Iterator[None]:
         drive(robot, random.random() - 0.25, 0.25 * (random.random() - 0.5))
-        robot.sleep(0.2 + random.random() * 1.3)
+        yield from wait(robot, 0.2 + random.random() * 1.3)
 
 
 STEERING_THRESHOLD_METRES = 2.5
-TOWER_RADIUS = 0.1
 TOWER_ANGLE = math.radians(80)
 IN_PLACE_TURN_RATE_PER_SECOND = math.radians(75)
 FULL_DEFLECTION_TURN_RATE_PER_SECOND = math.radians(75)
@@ -51,10 +80,10 @@ class GoRelative(Action):
     def relative_bearing(self, state: State, view: View) -> float:
         raise NotImplementedError
 
-    def perform(self, robot: Robot, state: State, view: View) -> None:
+    def tick(self, robot: Robot, state: State, view: View) -> None:
         heading_error = self.relative_bearing(state, view)
         heading_error = (math.pi + heading_error) % math.tau - math.pi
-        print(f"  RB is {math.degrees(heading_error)}°", end='')
+        desired_bearing = heading_error
         # Add some pseudo heading error if the proximity sensors are going off
         left_distance = view.left_distance
         right_distance = view.right_distance
@@ -89,19 +118,27 @@ class GoRelative(Action):
         if view.right_distance < STEERING_THRESHOLD_METRES:
             heading_error -= math.tan(TOWER_CLEARANCE_DISTANCE / view.right_distance)
             turn_back = True
-        if turn_back:
-            print(f", steering {math.degrees(heading_error)}°", end='')
         if -IN_PLACE_THRESHOLD < heading_error < IN_PLACE_THRESHOLD:
-            print("... moving ahead")
+            mode = STEER_AHEAD
             deflection = state.heading_pid.step(heading_error)
             drive(robot, FORWARD_POWER, FULL_DEFLECTION_TURN_RATE_PER_SECOND * deflection)
         elif heading_error > 0:
-            print("... turning right")
+            mode = STEER_RIGHT
             drive(robot, -0.2 if turn_back else 0.2, IN_PLACE_TURN_RATE_PER_SECOND)
-        elif heading_error < 0:
-            print("... turning left")
+        else:
+            mode = STEER_LEFT
             drive(robot, -0.2 if turn_back else 0.2, -IN_PLACE_TURN_RATE_PER_SECOND)
-        robot.sleep(1 / 100)
+
+        now = robot.time()
+        TELEMETRY.record(STEER, now, desired_bearing, heading_error, mode)
+        if TELEMETRY.console('steer', now):
+            steering = f", steering {math.degrees(heading_error)}°" if turn_back else ''
+            description = {
+                STEER_AHEAD: "moving ahead",
+                STEER_RIGHT: "turning right",
+                STEER_LEFT: "turning left",
+            }[mode]
+            print(f"  RB is {math.degrees(desired_bearing)}°{steering}... {description}")
 
 
 class Go(GoRelative):
@@ -132,7 +169,8 @@ class Goto(Go):
         target = self.target()
         #print("Target is: ", target, self)
         heading = math.atan2(target.x - state.kalman.location.x, target.y - state.kalman.location.y)
-        print(f"Target {target} ({self}) direct routing on heading {math.degrees(heading) % 360:.0f}°")
+        if TELEMETRY.console('target', state.kalman_time):
+            print(f"Target {target} ({self}) direct routing on heading {math.degrees(heading) % 360:.0f}°")
         return heading
 
 
@@ -149,69 +187,213 @@ class GotoStation(Goto):
     station: StationCode
 
     def target(self) -> Location:
-        location = STATION_CODE_LOCATIONS[self.station]
-        try:
-            optimal_capture_angle = OPTIMAL_CAPTURE_ANGLES[self.station]
-        except KeyError:
-            return location
+        return capture_point(self.station)
+
+
+# Pure pursuit along a waypoint path: steer on the arc through a point a fixed
+# distance further along the path, slowing for tight arcs and near the end.
+LOOKAHEAD_DISTANCE = 0.6
+# Beyond this bearing to the lookahead point, turn on the spot instead
+PURSUIT_IN_PLACE_THRESHOLD = math.radians(100)
+# Forward power is divided by (1 + this * |curvature|)
+CURVATURE_SLOWDOWN = 0.1
+GOAL_SLOWDOWN_DISTANCE = 0.5
+MINIMUM_APPROACH_POWER = 0.5
+# drive() turns the robot at twice the rate it's asked for under the wheel
+# model in kalman.py, so halve the rate needed to hold the arc
+PURSUIT_TURN_SCALE = 0.5
+
+
+def _lookahead_point(path: Sequence[Location], location: Location, distance: float) -> Location:
+    # Project onto the nearest segment of the path, then walk along it
+    best_squared = math.inf
+    best_segment = 0
+    best_fraction = 0.0
+    segments = []
+    for index, point in enumerate(path):
+        start = path[index - 1] if index > 0 else location
+        dx = point.x - start.x
+        dy = point.y - start.y
+        length_squared = dx * dx + dy * dy
+        if length_squared > 0:
+            fraction = ((location.x - start.x) * dx + (location.y - start.y) * dy) / length_squared
+            fraction = min(1.0, max(0.0, fraction))
         else:
+            fraction = 1.0
+        px = start.x + fraction * dx - location.x
+        py = start.y + fraction * dy - location.y
+        if px * px + py * py < best_squared:
+            best_squared = px * px + py * py
+            best_segment = index
+            best_fraction = fraction
+        segments.append((start, point, math.sqrt(length_squared)))
+
+    remaining = distance
+    for index in range(best_segment, len(segments)):
+        start, end, length = segments[index]
+        fraction = best_fraction if index == best_segment else 0.0
+        available = length * (1 - fraction)
+        if available >= remaining and length > 0:
+            along = fraction + remaining / length
             return Location(
-                x=location.x + math.sin(optimal_capture_angle) * 0.4,
-                y=location.y + math.cos(optimal_capture_angle) * 0.4,
+                x=start.x + (end.x - start.x) * along,
+                y=start.y + (end.y - start.y) * along,
+            )
+        remaining -= available
+    return path[-1]
+
+
+@dataclasses.dataclass(frozen=True)
+class FollowPath(Action):
+    path: Tuple[Location, ...]
+
+    def __str__(self) -> str:
+        goal = self.path[-1]
+        return f"FollowPath(to ({goal.x:.2f}, {goal.y:.2f}) via {len(self.path) - 1} waypoints)"
+
+    def tick(self, robot: Robot, state: State, view: View) -> None:
+        location = state.kalman.location
+        heading = state.kalman.heading
+        goal = self.path[-1]
+        target = _lookahead_point(self.path, location, LOOKAHEAD_DISTANCE)
+
+        dx = target.x - location.x
+        dy = target.y - location.y
+        ahead = dx * math.sin(heading) + dy * math.cos(heading)
+        # Positive to the right, matching positive turn rates
+        lateral = dx * math.cos(heading) - dy * math.sin(heading)
+        path_bearing = math.atan2(lateral, ahead)
+        # Steer away from anything the ultrasounds pick up, as GoRelative does
+        bearing = path_bearing
+        if view.left_distance < STEERING_THRESHOLD_METRES:
+            bearing += math.tan(TOWER_CLEARANCE_DISTANCE / view.left_distance)
+        if view.right_distance < STEERING_THRESHOLD_METRES:
+            bearing -= math.tan(TOWER_CLEARANCE_DISTANCE / view.right_distance)
+
+        # Only the path decides whether to turn on the spot; avoidance just
+        # bends the arc, otherwise it can trap us spinning back and forth
+        if abs(path_bearing) > PURSUIT_IN_PLACE_THRESHOLD:
+            mode = STEER_RIGHT if path_bearing > 0 else STEER_LEFT
+            drive(robot, 0, math.copysign(IN_PLACE_TURN_RATE_PER_SECOND, path_bearing))
+        else:
+            mode = STEER_AHEAD
+            # The arc through the lookahead point, on the adjusted bearing
+            bearing = min(math.pi / 2, max(-math.pi / 2, bearing))
+            curvature = 2 * math.sin(bearing) / max(math.hypot(dx, dy), 1e-3)
+            goal_distance = math.hypot(goal.x - location.x, goal.y - location.y)
+            forward = (
+                FORWARD_POWER /
+                (1 + CURVATURE_SLOWDOWN * abs(curvature)) *
+                min(1.0, max(MINIMUM_APPROACH_POWER, goal_distance / GOAL_SLOWDOWN_DISTANCE))
             )
+            drive(robot, forward, PURSUIT_TURN_SCALE * curvature * forward * MOTOR_LINEAR_SPEED)
+
+        now = robot.time()
+        TELEMETRY.record(STEER, now, path_bearing, bearing, mode)
 
 
 @dataclasses.dataclass(frozen=True)
 class ClaimImmediate(Action):
     station: StationCode
+    priority = CLAIM_PRIORITY
 
-    def perform(self, robot: Robot, state: State, view: View) -> None:
+    def perform(self, robot: Robot, state: State, view: View) -> Iterator[None]:
         drive(robot, 0)
-        robot.radio.claim_territory()
-        new_targets = robot.radio.sweep()
+        if state.radio is None:
+            robot.radio.claim_territory()
+            new_targets = robot.radio.sweep()
+        else:
+            # Wait for the sweeper a tick at a time rather than blocking, so
+            # nothing else sharing the state is held up meanwhile
+            claimed_at = state.radio.claim_territory()
+            give_up = robot.time() + SWEEP_TIMEOUT
+            snapshot = state.radio.newer_than(claimed_at)
+            while snapshot is None and robot.time() < give_up:
+                yield
+                snapshot = state.radio.newer_than(claimed_at)
+            if snapshot is None:
+                snapshot = state.radio.sweep()
+            new_targets = snapshot.targets
         successful = False
         for target in new_targets:
             if target.target_info.station_code == self.station:
                 if target.target_info.owned_by == state.zone:
                     successful = True
                 break
+        station_bit = STATION_BITS[self.station]
         if successful:
             # We claimed this one, mark all downstreams as now capturable
-            new_uncapturable = set(state.uncapturable)
-            new_uncapturable.discard(self.station)
-            for successor, predecessors in PREDECESSORS[Claimant(robot.zone)].items():
-                if predecessors is None:
-                    continue
-                if self.station in predecessors:
-                    new_uncapturable.discard(successor)
+            state.uncapturable = StationSet.from_mask(
+                state.uncapturable.mask & ~(station_bit | SUCCESSOR_MASKS[robot.zone][self.station])
+            )
             new_cap_count = dict(state.num_captures)
             new_cap_count[self.station] += 1
-            state.uncapturable = frozenset(new_uncapturable)
             state.num_captures = new_cap_count
         else:
-            # We failed to claim this one, assume that all predecessors became unowned
-            predecessors = PREDECESSORS[Claimant(robot.zone)][self.station]
-            if predecessors is None:
-                new_owned = state.captured
-            else:
-                new_owned = frozenset(state.captured - set(predecessors))
-            state.uncapturable = state.uncapturable | {self.station}
-            state.captured = new_owned
+            # We failed to claim this one, assume that all predecessors became unowned
+            state.uncapturable = StationSet.from_mask(state.uncapturable.mask | station_bit)
+            state.captured = StationSet.from_mask(
+                state.captured.mask & ~PREDECESSOR_MASKS[robot.zone][self.station]
+            )
+        state.decisions.invalidate()
         drive(robot, -0.5)
-        robot.sleep(0.2)
+        yield from wait(robot, 0.2)
 
         if NERF_MODE:
             if random.random() < 0.5:
                 drive(robot, 0, math.radians(90) / 3)
             else:
                 drive(robot, 0, -math.radians(90) / 3)
-            robot.sleep(3)
+            yield from wait(robot, 3)
             drive(robot, 0)
-            robot.sleep(1)
+            yield from wait(robot, 1)
 
 
 @dataclasses.dataclass(frozen=True)
 class BackOff(Action):
-    def perform(self, robot: Robot, state: State, view: View) -> State:
+    priority = AVOID_PRIORITY
+
+    def perform(self, robot: Robot, state: State, view: View) -> Iterator[None]:
         drive(robot, -0.6, IN_PLACE_TURN_RATE_PER_SECOND * (0.15 * random.random() + 0.4))
-        robot.sleep(0.4)
+        yield from wait(robot, 0.4)
+
+
+# Give the other robot room when we bump into it. Unlike a wall it will
+# probably move, so back straight off a little and wait rather than turning
+# away from our path.
+GIVE_WAY_TIME = 0.8
+
+
+@dataclasses.dataclass(frozen=True)
+class GiveWay(Action):
+    priority = AVOID_PRIORITY
+
+    def perform(self, robot: Robot, state: State, view: View) -> Iterator[None]:
+        drive(robot, -0.6)
+        yield from wait(robot, 0.3)
+        drive(robot, 0)
+        yield from wait(robot, GIVE_WAY_TIME * (0.5 + random.random()))
+
+
+# Steps the running action once per tick. Each tick's decision either replaces
+# it, if the running action has finished or the new one has a higher
+# priority, or is dropped in favour of letting the running one carry on.
+class ActionRunner:
+    def __init__(self) -> None:
+        self.action: Optional[Action] = None
+        self.steps: Optional[Iterator[None]] = None
+        self.preemptions = 0
+
+    def step(self, robot: Robot, state: State, view: View, chosen: Action) -> Action:
+        if self.steps is not None and chosen.priority > self.action.priority:
+            self.steps.close()
+            self.steps = None
+            self.preemptions += 1
+        if self.steps is None:
+            self.action = chosen
+            self.steps = chosen.perform(robot, state, view)
+        try:
+            next(self.steps)
+        except StopIteration:
+            self.steps = None
+        return self.action
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sr.robot import Robot
+from sr.robot.radio import Target
+
+from albot.state import initial_state, State
+from albot.view import View, make_view, read_compass, read_ruggeduino
+from albot.actions import Action, ActionRunner, DRIVE_PRIORITY
+from albot.decisions import choose_action
+from albot.sweeper import RadioSweeper
+from albot.scheduler import RateScheduler
+from albot.telemetry import TELEMETRY
+from albot.view_state_update import update_state_from_view
+
+T = TypeVar('T')
+
+
+# Rates of each stage, in ticks per second of robot time. The radio isn't
+# paced, it sweeps back to back.
+SENSE_RATE = 100.0
+ESTIMATE_RATE = 100.0
+DECIDE_RATE = 20.0
+ACTUATE_RATE = 100.0
+
+
+# Holds only the latest value published, so a slow consumer skips straight to
+# the newest rather than working through a backlog. Only used from the event
+# loop's thread.
+class Latest(Generic[T]):
+    def __init__(self) -> None:
+        self.value: Optional[T] = None
+        self.version = 0
+        self.changed = asyncio.Event()
+
+    def publish(self, value: T) -> None:
+        self.value = value
+        self.version += 1
+        self.changed.set()
+
+    async def newer_than(self, version: int) -> Tuple[int, T]:
+        while self.version <= version:
+            self.changed.clear()
+            await self.changed.wait()
+        return self.version, self.value
+
+
+# The control loop of albot.main.run split into stages, each a coroutine
+# running at its own rate and passing on what it produces through a Latest
+# channel:
+#
+#   compass, ruggeduino, radio -> estimate -> decide -> actuate
+#
+# Anything that blocks runs on an executor thread, so a slow sweep only holds
+# up its own stage. The estimator, decisions and actions each have their own
+# thread too, and take turns with the State through a lock: choose_action
+# updates the target and the decision cache, and the pose is updated in
+# place, so none of them can safely run alongside another. Nothing sleeps
+# while holding it: NERF mode's thinking time is spent before choose_action
+# takes the lock, and a claim waits for the sweeper a tick at a time. A claim
+# does still hold it while waiting for a sweep already in progress to finish
+# with the radio.
+class AsyncRuntime:
+    def __init__(self, robot: Robot, state: State, sweeper: RadioSweeper, time_scale: float) -> None:
+        self.robot = robot
+        self.state = state
+        self.sweeper = sweeper
+        # Robot seconds per wall second, where the robot is simulated faster
+        # than real time
+        self.time_scale = time_scale
+
+        self.compass: Latest[Tuple[float, float]] = Latest()
+        self.ruggeduino: Latest[Tuple[Tuple[float, float, bool], float]] = Latest()
+        self.radio: Latest[Tuple[Sequence[Target], float]] = Latest()
+        self.views: Latest[View] = Latest()
+        self.decisions: Latest[Action] = Latest()
+
+        self.sensors = ThreadPoolExecutor(max_workers=2, thread_name_prefix='sensors')
+        self.radio_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='radio')
+        self.estimate_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='estimate')
+        self.decision_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decide')
+        self.actuate_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix='actuate')
+        self.state_lock = threading.Lock()
+
+        self.schedulers: List[Tuple[str, RateScheduler]] = []
+
+    def scheduler(self, name: str, rate: float) -> RateScheduler:
+        scheduler = RateScheduler(self.robot, rate)
+        self.schedulers.append((name, scheduler))
+        return scheduler
+
+    async def tick(self, scheduler: RateScheduler) -> None:
+        remaining = scheduler.end_tick()
+        await asyncio.sleep(max(0.0, remaining) / self.time_scale)
+
+    def locked(self, function: Callable[..., T], *args: Any) -> T:
+        with self.state_lock:
+            return function(*args)
+
+    async def poll(self, name: str, channel: Latest[T], read: Callable[[Robot], T]) -> None:
+        loop = asyncio.get_running_loop()
+        scheduler = self.scheduler(name, SENSE_RATE)
+        while True:
+            channel.publish(await loop.run_in_executor(self.sensors, read, self.robot))
+            await self.tick(scheduler)
+
+    async def sweep(self) -> None:
+        # Through the sweeper, so that claims made by actions wait for the
+        # radio and can ask for a sweep taken after them
+        loop = asyncio.get_running_loop()
+        while True:
+            snapshot = await loop.run_in_executor(self.radio_thread, self.sweeper.sweep)
+            self.radio.publish((snapshot.targets, snapshot.time))
+
+    async def estimate(self) -> None:
+        loop = asyncio.get_running_loop()
+        await self.compass.newer_than(0)
+        await self.ruggeduino.newer_than(0)
+        await self.radio.newer_than(0)
+        scheduler = self.scheduler('estimate', ESTIMATE_RATE)
+        while True:
+            view = make_view(self.robot, self.compass.value, self.radio.value, self.ruggeduino.value)
+            await loop.run_in_executor(
+                self.estimate_thread,
+                self.locked,
+                update_state_from_view,
+                self.robot,
+                self.state,
+                view,
+            )
+            self.views.publish(view)
+            await self.tick(scheduler)
+
+    async def decide(self) -> None:
+        loop = asyncio.get_running_loop()
+        scheduler = self.scheduler('decide', DECIDE_RATE)
+        version = 0
+        while True:
+            version, view = await self.views.newer_than(version)
+            action = await loop.run_in_executor(
+                self.decision_thread,
+                choose_action,
+                self.robot,
+                self.state,
+                view,
+                self.state_lock,
+            )
+            self.decisions.publish(action)
+            await self.tick(scheduler)
+
+    async def actuate(self) -> None:
+        # Steering is redone every tick from the latest pose until the next
+        # decision, but anything else only runs once per decision to run it
+        loop = asyncio.get_running_loop()
+        await self.decisions.newer_than(0)
+        scheduler = self.scheduler('actuate', ACTUATE_RATE)
+        runner = ActionRunner()
+        started = 0
+        last_action = ''
+        while True:
+            version = self.decisions.version
+            chosen = self.decisions.value
+            if runner.steps is not None or version != started or chosen.priority == DRIVE_PRIORITY:
+                action = await loop.run_in_executor(
+                    self.actuate_thread,
+                    self.locked,
+                    runner.step,
+                    self.robot,
+                    self.state,
+                    self.views.value,
+                    chosen,
+                )
+                if action is chosen:
+                    started = version
+                action_desc = str(action)
+                if action_desc != last_action:
+                    print("Action: ", action_desc)
+                    last_action = action_desc
+            await self.tick(scheduler)
+
+    async def run(self) -> None:
+        tasks = [
+            asyncio.create_task(self.poll('compass', self.compass, read_compass)),
+            asyncio.create_task(self.poll('ruggeduino', self.ruggeduino, read_ruggeduino)),
+            asyncio.create_task(self.sweep()),
+            asyncio.create_task(self.estimate()),
+            asyncio.create_task(self.decide()),
+            asyncio.create_task(self.actuate()),
+        ]
+        try:
+            # Stages only finish by raising, which ends the whole run
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for executor in (
+                self.sensors,
+                self.radio_thread,
+                self.estimate_thread,
+                self.decision_thread,
+                self.actuate_thread,
+            ):
+                executor.shutdown(wait=False)
+            for name, scheduler in self.schedulers:
+                print(f"Scheduler ({name}): ", scheduler)
+            print("Decision cache: ", self.state.decisions)
+
+
+def run_async(
+    robot: Robot,
+    telemetry_path: Optional[str] = None,
+    localisation: str = 'kalman',
+    time_scale: float = 1.0,
+) -> None:
+    # An alternative to albot.main.run with each stage of the loop running
+    # concurrently
+    if telemetry_path is not None:
+        TELEMETRY.start(telemetry_path)
+    sweeper = RadioSweeper(robot)
+    state = initial_state(robot, localisation=localisation, radio=sweeper)
+    try:
+        asyncio.run(AsyncRuntime(robot, state, sweeper, time_scale).run())
+    finally:
+        TELEMETRY.stop()
@@ -0,0 +1,7 @@
+import os
+
+
+# Set ALBOT_SELF_CHECK=1 to check the navmesh and routing tables for
+# consistency as they're built, and cached decisions against fresh ones. Off
+# by default, since it slows start up and every tick.
+SELF_CHECK = os.environ.get('ALBOT_SELF_CHECK', '') not in ('', '0')
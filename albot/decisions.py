@@ -1,23 +1,61 @@
 from sr.robot import Robot, StationCode
 from albot.state import State
 from albot.nerf import NERF_MODE
-from albot.view import View, get_station_location
+from albot.view import View, get_station_location, MATCH_DURATION
 from albot.navmesh import get_next_hop, ZONE_CENTRES, get_zone
-from albot.actions import Action, DoNothing, ClaimImmediate, BackOff, GotoStation, MoveRandomly, GoHeading, GotoLocation
-from albot.planning import is_capturable, choose_next_target
+from albot.actions import Action, DoNothing, ClaimImmediate, BackOff, GotoStation, MoveRandomly, GoHeading, GotoLocation, FollowPath, GiveWay
+from albot.planning import is_capturable, choose_next_target_lookahead
+from albot.pathfinding import plan_path, cell_at
+from albot.debug import SELF_CHECK
 
 import random
+import contextlib
 import dataclasses
+from typing import ContextManager, Optional
 
 
 BEES = []
 
+# Pseudo-distance added per previous capture of a station, to spread our effort
+CAPTURE_COUNT_PENALTY = 0.7
 
-def choose_action(robot: Robot, state: State, view: View) -> Action:
+# Route over the occupancy grid rather than between navmesh zone centres
+USE_GRID_PLANNER = True
+# Track the whole planned path with pure pursuit, rather than heading
+# straight for its next waypoint
+USE_PATH_FOLLOWING = True
+
+# Steer clear of wherever ownership flips suggest the other robot is
+USE_OPPONENT_TRACKING = True
+# Pseudo-distance added to a station the other robot is certainly at
+CONTESTED_PENALTY = 6.0
+# Treat a bump as the other robot when it's this likely to be around us
+OPPONENT_NEARBY_PRESENCE = 0.3
+
+
+def _still_wanted(state: State, target: Optional[StationCode]) -> bool:
+    return (
+        target is not None and
+        target not in state.captured and
+        target not in state.uncapturable and
+        is_capturable(state.zone, target, state.captured)
+    )
+
+
+def choose_action(
+    robot: Robot,
+    state: State,
+    view: View,
+    state_lock: ContextManager[object] = contextlib.nullcontext(),
+) -> Action:
     if NERF_MODE:
-        # Artificial stupidity
+        # Artificial stupidity, which doesn't need the state
         robot.sleep(0.2)
+    with state_lock:
+        return _choose_action(robot, state, view)
 
+
+def _choose_action(robot: Robot, state: State, view: View) -> Action:
     # Consider immediate claim targets, where we're already within the territory
     for target in view.targets:
         if 1.0 / target.signal_strength > 0.22:
@@ -37,33 +75,62 @@ def choose_action(robot: Robot, state: State, view: View) -> Action:
 
         return ClaimImmediate(target.target_info.station_code)
 
+    now = robot.time()
+
     # Back off if we're in proximity
     if view.proximity:
+        if USE_OPPONENT_TRACKING and state.opponent.presence(state.kalman.location, now) > OPPONENT_NEARBY_PRESENCE:
+            print("> Bumped into something, probably the other robot")
+            return GiveWay()
         if random.random() < 0.95:
             return BackOff()
         else:
             return MoveRandomly()
 
-    if (
-        state.current_target is not None and
-        state.current_target not in state.captured and
-        state.current_target not in state.uncapturable and
-        is_capturable(state.zone, state.current_target, state.captured)
-    ):
-        target = state.current_target
-    else:
-        target = choose_next_target(
-            state.zone,
-            state.captured,
-            state.uncapturable,
-            from_location=state.kalman.location,
-            dropped=view.dropped,
-            pseudo_distances={
-                x: 0.7 * y
+    # Nothing below changes unless one of these does
+    cache = state.decisions
+    target = cache.lookup(state.current_zone, state.captured.mask, state.uncapturable.mask, view.dropped)
+    if target is None:
+        if _still_wanted(state, state.current_target):
+            target = state.current_target
+        else:
+            pseudo_distances = {
+                x: CAPTURE_COUNT_PENALTY * y
                 for x, y in state.num_captures.items()
-            },
-        )
-        state.current_target = target
+            }
+            if USE_OPPONENT_TRACKING:
+                for station in pseudo_distances:
+                    pseudo_distances[station] += CONTESTED_PENALTY * state.opponent.presence(get_station_location(station), now)
+            target = choose_next_target_lookahead(
+                state.zone,
+                state.captured,
+                state.uncapturable,
+                from_location=state.kalman.location,
+                dropped=view.dropped,
+                pseudo_distances=pseudo_distances,
+                time_remaining=MATCH_DURATION - now,
+            )
+            state.current_target = target
+        # A choice made in want of anything better is made afresh each tick
+        if _still_wanted(state, target):
+            cache.store(state.current_zone, state.captured.mask, state.uncapturable.mask, view.dropped, target)
+
+    if USE_GRID_PLANNER:
+        # The planned path only depends on the cell we're in
+        cell = cell_at(state.kalman.x, state.kalman.y)
+        cached = cache.route(target, view.dropped, cell)
+        if cached is not None and not SELF_CHECK:
+            return cached
+        path = plan_path(state.kalman.location, target, view.dropped)
+        if path is not None:
+            if USE_PATH_FOLLOWING:
+                action = FollowPath(tuple(path))
+            else:
+                action = GotoLocation(path[0])
+            if cached is not None:
+                assert cached == action, f"Cached route {cached} to {target} doesn't match the planned {action}"
+            cache.store_route(target, view.dropped, cell, action)
+            return action
 
     next_hop, route_direct = get_next_hop(get_zone(state.kalman.location), get_station_location(target), view.dropped)
     if route_direct:
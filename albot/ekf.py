@@ -0,0 +1,171 @@
+import math
+from typing import Sequence
+
+import numpy
+
+from sr.robot.radio import Target
+
+from albot.view import Location, get_station_location
+from albot.kalman import MOTOR_LINEAR_SPEED, MOTOR_LINEAR_SPEED_STDEV, LEVER_ARM
+
+
+INITIAL_LOCATION_STDEV = 0.1
+INITIAL_HEADING_STDEV = math.radians(5)
+
+# Process noise: wheel speed error scales with commanded power, with a floor
+# for slip and bumps, plus a slow random walk on the whole pose.
+WHEEL_SPEED_STDEV_FLOOR = 0.1 * MOTOR_LINEAR_SPEED_STDEV
+POSITION_DRIFT_PER_SQRT_SECOND = 0.02
+HEADING_DRIFT_PER_SQRT_SECOND = math.radians(4)
+
+COMPASS_STDEV = math.radians(5)
+RADIO_BEARING_STDEV = math.radians(6)
+RADIO_DISTANCE_STDEV = 0.08
+RADIO_DISTANCE_STDEV_PER_METRE = 0.05
+
+
+def _wrap(angle: float) -> float:
+    return (angle + math.pi) % math.tau - math.pi
+
+
+# Extended Kalman filter over (x, y, heading) with a full covariance. It
+# exposes the same accessors as KalmanFilter so it can stand in for it.
+class PoseKalmanFilter:
+    def __init__(self, initial_position: Location, initial_heading: float) -> None:
+        self.state = numpy.array([initial_position.x, initial_position.y, initial_heading % math.tau])
+        self.covariance = numpy.diag([
+            INITIAL_LOCATION_STDEV ** 2,
+            INITIAL_LOCATION_STDEV ** 2,
+            INITIAL_HEADING_STDEV ** 2,
+        ])
+
+    @property
+    def x(self) -> float:
+        return float(self.state[0])
+
+    @property
+    def y(self) -> float:
+        return float(self.state[1])
+
+    @property
+    def location(self) -> Location:
+        return Location(x=float(self.state[0]), y=float(self.state[1]))
+
+    @property
+    def location_error(self) -> float:
+        return math.sqrt(self.covariance[0, 0] + self.covariance[1, 1])
+
+    @property
+    def heading(self) -> float:
+        return float(self.state[2])
+
+    @property
+    def heading_error(self) -> float:
+        return math.sqrt(self.covariance[2, 2])
+
+    def tick(self, dt: float, left_power: float, right_power: float) -> None:
+        if dt <= 0:
+            return
+        left_velocity = MOTOR_LINEAR_SPEED * left_power / 100
+        right_velocity = MOTOR_LINEAR_SPEED * right_power / 100
+        surge = (left_velocity + right_velocity) * 0.5
+        rotation = (left_velocity - right_velocity) / LEVER_ARM
+
+        heading = self.state[2]
+        sin_heading = math.sin(heading)
+        cos_heading = math.cos(heading)
+        self.state[0] += surge * sin_heading * dt
+        self.state[1] += surge * cos_heading * dt
+        self.state[2] = (heading + rotation * dt) % math.tau
+
+        motion_jacobian = numpy.array([
+            [1.0, 0.0, surge * cos_heading * dt],
+            [0.0, 1.0, -surge * sin_heading * dt],
+            [0.0, 0.0, 1.0],
+        ])
+        # Sensitivity of the pose to each wheel's velocity
+        wheel_jacobian = numpy.array([
+            [0.5 * sin_heading * dt, 0.5 * sin_heading * dt],
+            [0.5 * cos_heading * dt, 0.5 * cos_heading * dt],
+            [dt / LEVER_ARM, -dt / LEVER_ARM],
+        ])
+        wheel_noise = numpy.diag([
+            max(WHEEL_SPEED_STDEV_FLOOR, MOTOR_LINEAR_SPEED_STDEV * abs(left_power) / 100) ** 2,
+            max(WHEEL_SPEED_STDEV_FLOOR, MOTOR_LINEAR_SPEED_STDEV * abs(right_power) / 100) ** 2,
+        ])
+        drift = numpy.diag([
+            POSITION_DRIFT_PER_SQRT_SECOND ** 2 * dt,
+            POSITION_DRIFT_PER_SQRT_SECOND ** 2 * dt,
+            HEADING_DRIFT_PER_SQRT_SECOND ** 2 * dt,
+        ])
+        self.covariance = (
+            motion_jacobian @ self.covariance @ motion_jacobian.T +
+            wheel_jacobian @ wheel_noise @ wheel_jacobian.T +
+            drift
+        )
+
+    def update_heading(self, compass: float) -> None:
+        self._update(
+            innovation=numpy.array([_wrap(compass - self.state[2])]),
+            jacobian=numpy.array([[0.0, 0.0, 1.0]]),
+            noise=numpy.array([COMPASS_STDEV ** 2]),
+        )
+
+    def update_location(self, location: Location, stdev: float) -> None:
+        self._update(
+            innovation=numpy.array([location.x - self.state[0], location.y - self.state[1]]),
+            jacobian=numpy.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]),
+            noise=numpy.array([stdev ** 2, stdev ** 2]),
+        )
+
+    def update_targets(self, targets: Sequence[Target]) -> None:
+        # One batched update over the range and bearing to every target in a
+        # sweep, so correlations between them are accounted for properly.
+        if not targets:
+            return
+        count = len(targets)
+        stations = numpy.empty((count, 2))
+        measured_distance = numpy.empty(count)
+        measured_bearing = numpy.empty(count)
+        for index, target in enumerate(targets):
+            station = get_station_location(target.target_info.station_code)
+            stations[index, 0] = station.x
+            stations[index, 1] = station.y
+            measured_distance[index] = target.signal_strength ** -0.5
+            measured_bearing[index] = target.bearing
+
+        dx = stations[:, 0] - self.state[0]
+        dy = stations[:, 1] - self.state[1]
+        range_squared = numpy.maximum(dx * dx + dy * dy, 1e-6)
+        predicted_distance = numpy.sqrt(range_squared)
+        predicted_bearing = numpy.arctan2(dx, dy) - self.state[2]
+
+        innovation = numpy.empty(2 * count)
+        innovation[0::2] = measured_distance - predicted_distance
+        innovation[1::2] = (measured_bearing - predicted_bearing + math.pi) % math.tau - math.pi
+
+        jacobian = numpy.zeros((2 * count, 3))
+        jacobian[0::2, 0] = -dx / predicted_distance
+        jacobian[0::2, 1] = -dy / predicted_distance
+        jacobian[1::2, 0] = -dy / range_squared
+        jacobian[1::2, 1] = dx / range_squared
+        jacobian[1::2, 2] = -1.0
+
+        noise = numpy.empty(2 * count)
+        noise[0::2] = (RADIO_DISTANCE_STDEV + RADIO_DISTANCE_STDEV_PER_METRE * measured_distance) ** 2
+        noise[1::2] = RADIO_BEARING_STDEV ** 2
+
+        self._update(innovation, jacobian, noise)
+
+    def _update(self, innovation: numpy.ndarray, jacobian: numpy.ndarray, noise: numpy.ndarray) -> None:
+        measurement_noise = numpy.diag(noise)
+        innovation_covariance = jacobian @ self.covariance @ jacobian.T + measurement_noise
+        gain = numpy.linalg.solve(innovation_covariance, jacobian @ self.covariance).T
+        self.state += gain @ innovation
+        self.state[2] %= math.tau
+        # Joseph form keeps the covariance symmetric and positive definite
+        correction = numpy.eye(3) - gain @ jacobian
+        self.covariance = (
+            correction @ self.covariance @ correction.T +
+            gain @ measurement_noise @ gain.T
+        )
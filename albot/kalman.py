@@ -21,8 +21,11 @@
 # Detection standard deviation is 80mm
 
 import math
+from typing import Sequence
 
-from albot.view import Location
+from sr.robot.radio import Target
+
+from albot.view import Location, Pose, single_target_fix
 
 
 MOTOR_LINEAR_SPEED = 0.989
@@ -37,44 +40,72 @@ def compass_stdev_by_heading(heading: float) -> float:
     return (heading_error_maximum - heading_error_minimum) ** 2 / math.sqrt(12)
 
 
+# The pose is updated in place, so running the filter doesn't allocate;
+# location builds a Location when one is asked for
 class KalmanFilter:
+    __slots__ = ('pose', 'location_error', 'heading_error', '_fix')
+
     def __init__(self, initial_position: Location, initial_heading: float) -> None:
-        self.location = initial_position
+        self.pose = Pose(initial_position.x, initial_position.y, initial_heading)
         self.location_error = 0.1
-        self.heading = initial_heading
-        self.heading_error = compass_stdev_by_heading(self.heading)
+        self.heading_error = compass_stdev_by_heading(initial_heading)
+        # Scratch space for the position fix from each target
+        self._fix = Pose()
+
+    @property
+    def x(self) -> float:
+        return self.pose.x
+
+    @property
+    def y(self) -> float:
+        return self.pose.y
+
+    @property
+    def heading(self) -> float:
+        return self.pose.heading
+
+    @property
+    def location(self) -> Location:
+        return self.pose.location()
 
     def tick(self, dt: float, left_power: float, right_power: float) -> None:
+        pose = self.pose
         left_velocity = MOTOR_LINEAR_SPEED * left_power / 100
         right_velocity = MOTOR_LINEAR_SPEED * right_power / 100
         surge = (left_velocity + right_velocity) * 0.5
         rotation = (left_velocity - right_velocity) / LEVER_ARM
-        self.location = Location(
-            x=self.location.x + surge * math.sin(self.heading) * dt,
-            y=self.location.y + surge * math.cos(self.heading) * dt,
-        )
+        pose.x += surge * math.sin(pose.heading) * dt
+        pose.y += surge * math.cos(pose.heading) * dt
         self.location_error += MOTOR_LINEAR_SPEED_STDEV * dt * (0.1 + abs(surge) / MOTOR_LINEAR_SPEED)
-        self.heading = (self.heading + rotation * dt) % math.tau
+        pose.heading = (pose.heading + rotation * dt) % math.tau
         self.heading_error += (MOTOR_LINEAR_SPEED_STDEV / LEVER_ARM) * dt
         self.heading_error += HEADING_ERROR_PER_SECOND * dt
 
     def update_heading(self, compass: float) -> None:
-        err_θ = compass - self.heading
+        pose = self.pose
+        err_θ = compass - pose.heading
         err_θ = (err_θ + math.pi) % math.tau - math.pi
-        kalman_gain = self.heading_error / (self.heading_error + abs(err_θ) + compass_stdev_by_heading(self.heading))
+        kalman_gain = self.heading_error / (self.heading_error + abs(err_θ) + compass_stdev_by_heading(pose.heading))
         #print(f"Heading error is {math.degrees(err_θ):.1f}°, kalman gain is {kalman_gain:.4f}")
-        self.heading += kalman_gain * err_θ
-        self.heading = self.heading % math.tau
+        pose.heading = (pose.heading + kalman_gain * err_θ) % math.tau
         self.heading_error *= 1 - kalman_gain
 
     def update_location(self, location: Location, stdev: float) -> None:
-        err_x = location.x - self.location.x
-        err_y = location.y - self.location.y
+        self._update_position(location.x, location.y, stdev)
+
+    def _update_position(self, x: float, y: float, stdev: float) -> None:
+        pose = self.pose
+        err_x = x - pose.x
+        err_y = y - pose.y
         overall_error = math.hypot(err_x, err_y)
         kalman_gain = self.location_error / (self.location_error + overall_error + stdev)
         #print(f"Kalman gain is {kalman_gain}")
-        self.location = Location(
-            x=self.location.x + kalman_gain * err_x,
-            y=self.location.y + kalman_gain * err_y,
-        )
+        pose.x += kalman_gain * err_x
+        pose.y += kalman_gain * err_y
         self.location_error *= 1 - kalman_gain
+
+    def update_targets(self, targets: Sequence[Target]) -> None:
+        fix = self._fix
+        for target in targets:
+            single_target_fix(fix, self.pose.heading, target)
+            self._update_position(fix.x, fix.y, stdev=0.08)
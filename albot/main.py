@@ -1,27 +1,112 @@
+from typing import Optional
+
 from sr.robot import Robot
 
 from albot.state import initial_state, State
 from albot.view import get_world_view
 from albot.decisions import choose_action
+from albot.actions import ActionRunner
 from albot.view_state_update import update_state_from_view
-from albot.navmesh import get_zone
+from albot.navmesh import routing_tables
+from albot.pathfinding import build_grid, precompute_distance_fields
+from albot.scheduler import RateScheduler
+from albot.telemetry import TELEMETRY
+from albot.profiling import Profiler, NullProfiler, print_summary, install_report_signal
+
+
+CONTROL_RATE = 100.0
+SCHEDULER_REPORT_TICKS = 1000
+
+
+def prepare() -> None:
+    # Build the tables decisions need before and after the drop, including a
+    # distance field for every station, which would otherwise be built on the
+    # tick a station first becomes a target or the tick after the drop. Safe
+    # to call while waiting for the start signal, as we don't know our zone
+    # yet.
+    for dropped in (False, True):
+        routing_tables(dropped)
+        build_grid(dropped)
+        precompute_distance_fields(dropped)
+
 
-def run(robot: Robot) -> None:
-    state = initial_state(robot)
+def run(
+    robot: Robot,
+    rate: float = CONTROL_RATE,
+    telemetry_path: Optional[str] = None,
+    localisation: str = 'kalman',
+    concurrent_sensing: bool = False,
+    background_sweep: bool = False,
+    trace_path: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+) -> None:
+    if telemetry_path is not None:
+        TELEMETRY.start(telemetry_path)
+    # Optional parts are imported as they're asked for, to keep start up quick
+    sweeper = None
+    if background_sweep:
+        from albot.sweeper import RadioSweeper
+        sweeper = RadioSweeper(robot)
+        sweeper.start()
+    state = initial_state(robot, localisation=localisation, radio=sweeper)
+    trace = None
+    if trace_path is not None:
+        from albot.trace import TraceRecorder
+        trace = TraceRecorder(trace_path, robot.zone)
+    scheduler = RateScheduler(robot, rate)
+    # Compass and radio are read on worker threads while the ruggeduino is read here
+    executor = None
+    if concurrent_sensing:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=2)
+    if profiler is None:
+        profiler = NullProfiler()
+    restore_signal = install_report_signal(profiler)
+    runner = ActionRunner()
     last_action = ''
     last_zone = None
 
-    while True:
-        view = get_world_view(robot)
-        #print(view)
-        update_state_from_view(robot, state, view)
-        action = choose_action(robot, state, view)
-        action_desc = str(action)
-        if action_desc != last_action:
-            print("Action: ", action_desc)
-            last_action = action_desc
-        if state.current_zone != last_zone:
-            print("Zone: ", state.current_zone, state.kalman.location)
-            last_zone = state.current_zone
-        action.perform(robot, state, view)
-        robot.sleep(0.01)
+    try:
+        while True:
+            start = profiler.now()
+            view = get_world_view(robot, executor, sweeper)
+            start = profiler.lap('sense', start)
+            #print(view)
+            if trace is not None:
+                # The powers here are the ones the estimator ticks with below
+                trace.record(robot.time(), robot.motors[0].m0.power, robot.motors[0].m1.power, view)
+            update_state_from_view(robot, state, view)
+            start = profiler.lap('update', start)
+            chosen = choose_action(robot, state, view)
+            start = profiler.lap('decide', start)
+            # Either starts the chosen action or carries on with a manoeuvre
+            # it didn't pre-empt
+            action = runner.step(robot, state, view, chosen)
+            start = profiler.lap_action(action, start)
+            action_desc = str(action)
+            if action_desc != last_action:
+                print("Action: ", action_desc)
+                last_action = action_desc
+            if state.current_zone != last_zone:
+                print("Zone: ", state.current_zone, state.kalman.location)
+                last_zone = state.current_zone
+            scheduler.wait()
+            profiler.lap('wait', start)
+            if scheduler.ticks % SCHEDULER_REPORT_TICKS == 0:
+                print("Scheduler: ", scheduler)
+                print("Decision cache: ", state.decisions)
+                print_summary(profiler)
+    finally:
+        print("Scheduler: ", scheduler)
+        print(f"Actions: {runner.preemptions} pre-empted")
+        print("Decision cache: ", state.decisions)
+        print_summary(profiler)
+        if restore_signal is not None:
+            restore_signal()
+        TELEMETRY.stop()
+        if trace is not None:
+            trace.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        if sweeper is not None:
+            sweeper.stop()
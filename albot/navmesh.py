@@ -1,11 +1,27 @@
 import enum
 import math
+import heapq
+import bisect
+import functools
 
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from albot.view import Location
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.debug import SELF_CHECK
 from sr.robot import StationCode
 
+if TYPE_CHECKING:
+    import numpy
+    import numpy.typing
+
+
+# Half extents of the arena walls, measured from the centre
+ARENA_HALF_LENGTH = 7.5
+ARENA_HALF_WIDTH = 4.0
+# Radii of the robot's footprint, for either robot, and of each station's tower
+ROBOT_RADIUS = 0.25
+TOWER_RADIUS = 0.1
+
 
 OPTIMAL_CAPTURE_ANGLES = {
     StationCode.OX: math.radians(45),
@@ -19,6 +35,22 @@ OPTIMAL_CAPTURE_ANGLES = {
     StationCode.EY: math.radians(0),
     StationCode.PO: math.radians(0),
 }
+# How far out along its optimal capture angle to line up on a station
+CAPTURE_POINT_DISTANCE = 0.4
+
+
+def capture_point(station: StationCode) -> Location:
+    # Where to head to claim the station: out along its optimal capture
+    # angle where it has one, otherwise the station itself
+    location = STATION_CODE_LOCATIONS[station]
+    try:
+        optimal_capture_angle = OPTIMAL_CAPTURE_ANGLES[station]
+    except KeyError:
+        return location
+    return Location(
+        x=location.x + math.sin(optimal_capture_angle) * CAPTURE_POINT_DISTANCE,
+        y=location.y + math.cos(optimal_capture_angle) * CAPTURE_POINT_DISTANCE,
+    )
 
 
 class Zone(enum.Enum):
@@ -62,626 +94,261 @@ ZONE_CENTRES = {
 }
 
 
+# Zone boundaries as columns from left to right. Each column covers x values
+# below its bound (the last column is unbounded) and lists its rows from bottom
+# to top; a location is in a row if its y is above that row's lower bound.
+# The corner columns count y == -2.6 as part of the start zone rather than the
+# bottom corner, hence the bound just below it.
+_BOTTOM_CORNER_BOUND = math.nextafter(-2.6, -math.inf)
+
+ZONE_COLUMNS = (
+    (-5.575, (
+        (None, Zone.BOTTOM_LEFT_CORNER),
+        (_BOTTOM_CORNER_BOUND, Zone.PINK_START),
+        (2, Zone.PINK_TOP_CORNER),
+    )),
+    (-4.35, (
+        (None, Zone.BOTTOM_LEFT_LOWER),
+        (-0.9, Zone.LEFT_TRANSITION),
+        (-0.2, Zone.TOP_LEFT),
+    )),
+    (-3.7, (
+        (None, Zone.BOTTOM_LEFT_LOWER),
+        (-0.9, Zone.BOTTOM_LEFT_UPPER),
+        (-0.2, Zone.TOP_LEFT),
+    )),
+    (-1.95, (
+        (None, Zone.BOTTOM_LEFT_LOWER),
+        (-0.8, Zone.BOTTOM_LEFT_UPPER),
+        (0, Zone.TOP_CENTRE),
+    )),
+    (1.95, (
+        (None, Zone.BOTTOM_CENTRE_LOWER),
+        (-1, Zone.BOTTOM_CENTRE_UPPER),
+        (0, Zone.TOP_CENTRE),
+    )),
+    (3.7, (
+        (None, Zone.BOTTOM_RIGHT_LOWER),
+        (-0.8, Zone.BOTTOM_RIGHT_UPPER),
+        (0, Zone.TOP_CENTRE),
+    )),
+    (4.35, (
+        (None, Zone.BOTTOM_RIGHT_LOWER),
+        (-0.9, Zone.BOTTOM_RIGHT_UPPER),
+        (-0.2, Zone.TOP_RIGHT),
+    )),
+    (5.575, (
+        (None, Zone.BOTTOM_RIGHT_LOWER),
+        (-0.9, Zone.RIGHT_TRANSITION),
+        (-0.2, Zone.TOP_RIGHT),
+    )),
+    (None, (
+        (None, Zone.BOTTOM_RIGHT_CORNER),
+        (_BOTTOM_CORNER_BOUND, Zone.YELLOW_START),
+        (2, Zone.YELLOW_TOP_CORNER),
+    )),
+)
+
+# Compiled into sorted bound tables, so a lookup is two short bisections
+_COLUMN_BOUNDS = [bound for bound, _ in ZONE_COLUMNS[:-1]]
+_ROW_BOUNDS = [[bound for bound, _ in rows[1:]] for _, rows in ZONE_COLUMNS]
+_ROW_ZONES = [[zone for _, zone in rows] for _, rows in ZONE_COLUMNS]
+
+
+def get_zone_at(x: float, y: float) -> Zone:
+    column = bisect.bisect_right(_COLUMN_BOUNDS, x)
+    return _ROW_ZONES[column][bisect.bisect_left(_ROW_BOUNDS[column], y)]
+
+
 def get_zone(location: Location) -> Zone:
-    if location.x < -5.575:
-        if location.y > 2:
-            return Zone.PINK_TOP_CORNER
-        elif location.y < -2.6:
-            return Zone.BOTTOM_LEFT_CORNER
-        else:
-            return Zone.PINK_START
-    elif location.x < -4.35:
-        if location.y > -0.2:
-            return Zone.TOP_LEFT
-        elif location.y > -0.9:
-            return Zone.LEFT_TRANSITION
-        else:
-            return Zone.BOTTOM_LEFT_LOWER
-    elif location.x < -3.7:
-        if location.y > -0.2:
-            return Zone.TOP_LEFT
-        elif location.y > -0.9:
-            return Zone.BOTTOM_LEFT_UPPER
-        else:
-            return Zone.BOTTOM_LEFT_LOWER
-    elif location.x < -1.95:
-        if location.y > 0:
-            return Zone.TOP_CENTRE
-        elif location.y > -0.8:
-            return Zone.BOTTOM_LEFT_UPPER
-        else:
-            return Zone.BOTTOM_LEFT_LOWER
-    elif location.x < 1.95:
-        if location.y > 0:
-            return Zone.TOP_CENTRE
-        elif location.y > -1:
-            return Zone.BOTTOM_CENTRE_UPPER
-        else:
-            return Zone.BOTTOM_CENTRE_LOWER
-    elif location.x < 3.7:
-        if location.y > 0:
-            return Zone.TOP_CENTRE
-        elif location.y > -0.8:
-            return Zone.BOTTOM_RIGHT_UPPER
-        else:
-            return Zone.BOTTOM_RIGHT_LOWER
-    elif location.x < 4.35:
-        if location.y > -0.2:
-            return Zone.TOP_RIGHT
-        elif location.y > -0.9:
-            return Zone.BOTTOM_RIGHT_UPPER
-        else:
-            return Zone.BOTTOM_RIGHT_LOWER
-    elif location.x < 5.575:
-        if location.y > -0.2:
-            return Zone.TOP_RIGHT
-        elif location.y > -0.9:
-            return Zone.RIGHT_TRANSITION
-        else:
-            return Zone.BOTTOM_RIGHT_LOWER
-    else:
-        if location.y > 2:
-            return Zone.YELLOW_TOP_CORNER
-        elif location.y < -2.6:
-            return Zone.BOTTOM_RIGHT_CORNER
-        else:
-            return Zone.YELLOW_START
-
-
-ROUTING_PRE_DROP = {
-    (Zone.PINK_START, Zone.PINK_TOP_CORNER): Zone.PINK_TOP_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.RIGHT_TRANSITION): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.YELLOW_START): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.TOP_RIGHT): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_TOP_CORNER, Zone.PINK_START): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.LEFT_TRANSITION): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.RIGHT_TRANSITION): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_LEFT): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.YELLOW_START): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_RIGHT): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_CENTRE): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.YELLOW_TOP_CORNER): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.PINK_START): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.PINK_TOP_CORNER): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.YELLOW_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_RIGHT): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_TOP_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.LEFT_TRANSITION): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.PINK_START): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.TOP_LEFT): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.TOP_CENTRE): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.PINK_TOP_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.LEFT_TRANSITION): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.PINK_START): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_LEFT): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_CENTRE): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.YELLOW_TOP_CORNER, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.RIGHT_TRANSITION): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.LEFT_TRANSITION): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_RIGHT): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.PINK_START): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_LEFT): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_CENTRE): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.PINK_TOP_CORNER): Zone.YELLOW_START,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.PINK_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.PINK_START): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.YELLOW_START): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_RIGHT): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.LEFT_TRANSITION): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.PINK_START): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_LEFT): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_CENTRE): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.PINK_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_LEFT): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.PINK_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_CENTRE): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_RIGHT): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.YELLOW_START): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_RIGHT): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.LEFT_TRANSITION): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_CENTRE): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.PINK_START): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_LEFT): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_CENTRE): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_RIGHT): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.PINK_START): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.RIGHT_TRANSITION): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.YELLOW_START): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_CENTRE): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_LEFT): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.LEFT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.PINK_START): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.PINK_TOP_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.TOP_LEFT, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.TOP_CENTRE): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.TOP_RIGHT): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_CENTRE_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_CENTRE_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.RIGHT_TRANSITION): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.PINK_START): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.PINK_TOP_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.YELLOW_START): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.YELLOW_TOP_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.TOP_CENTRE): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.TOP_LEFT): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_CENTRE_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_CENTRE_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.LEFT_TRANSITION): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.YELLOW_START): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.YELLOW_TOP_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.PINK_START): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.PINK_TOP_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_CENTRE, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.LEFT_TRANSITION): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.RIGHT_TRANSITION): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_UPPER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_UPPER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_LOWER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_CENTRE_LOWER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_CENTRE_UPPER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_LOWER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_CORNER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_CORNER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.PINK_START): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.YELLOW_START): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.PINK_TOP_CORNER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.YELLOW_TOP_CORNER): Zone.TOP_RIGHT,
-}
+    return get_zone_at(location.x, location.y)
 
-ROUTING_POST_DROP = {
-    (Zone.PINK_START, Zone.PINK_TOP_CORNER): Zone.PINK_TOP_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.PINK_START, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.TOP_CENTRE): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.TOP_RIGHT): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_START, Zone.RIGHT_TRANSITION): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.YELLOW_START): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.YELLOW_TOP_CORNER): Zone.TOP_LEFT,
-    (Zone.PINK_START, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.PINK_TOP_CORNER, Zone.PINK_START): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.PINK_START,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_CENTRE): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.TOP_RIGHT): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.PINK_TOP_CORNER, Zone.RIGHT_TRANSITION): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.YELLOW_START): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.YELLOW_TOP_CORNER): Zone.TOP_LEFT,
-    (Zone.PINK_TOP_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.PINK_START): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.PINK_TOP_CORNER): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_LEFT): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_CENTRE): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.TOP_RIGHT): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.YELLOW_START): Zone.PINK_START,
-    (Zone.BOTTOM_LEFT_CORNER, Zone.YELLOW_TOP_CORNER): Zone.PINK_START,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_TOP_CORNER,
-    (Zone.YELLOW_START, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_START, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.TOP_CENTRE): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.TOP_LEFT): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.YELLOW_START, Zone.LEFT_TRANSITION): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.PINK_START): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.PINK_TOP_CORNER): Zone.TOP_RIGHT,
-    (Zone.YELLOW_START, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_RIGHT): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_CENTRE): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.TOP_LEFT): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.LEFT_TRANSITION): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.PINK_START): Zone.YELLOW_START,
-    (Zone.BOTTOM_RIGHT_CORNER, Zone.PINK_TOP_CORNER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_CORNER): Zone.YELLOW_START,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_RIGHT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_CENTRE): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_CENTRE_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_CENTRE_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.TOP_LEFT): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.YELLOW_TOP_CORNER, Zone.LEFT_TRANSITION): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.PINK_START): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.PINK_TOP_CORNER): Zone.TOP_RIGHT,
-    (Zone.YELLOW_TOP_CORNER, Zone.BOTTOM_LEFT_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.PINK_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_CENTRE_UPPER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.PINK_START): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_LEFT): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.PINK_TOP_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_CENTRE): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.YELLOW_START): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.TOP_RIGHT): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_LOWER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_RIGHT): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.YELLOW_TOP_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.LEFT_TRANSITION): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_CENTRE): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.PINK_START): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.TOP_LEFT): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_LOWER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.LEFT_TRANSITION): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.PINK_START): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_LEFT): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_RIGHT): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.YELLOW_START): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.BOTTOM_CENTRE_LOWER, Zone.TOP_CENTRE): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_LEFT): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.PINK_START): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.PINK_TOP_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.RIGHT_TRANSITION): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_CENTRE): Zone.LEFT_TRANSITION,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.TOP_RIGHT): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.YELLOW_START): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_LEFT_UPPER, Zone.YELLOW_TOP_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_CENTRE_UPPER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_RIGHT): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.YELLOW_START): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.YELLOW_TOP_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.LEFT_TRANSITION): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_CENTRE): Zone.RIGHT_TRANSITION,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.PINK_START): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.TOP_LEFT): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.BOTTOM_RIGHT_UPPER, Zone.PINK_TOP_CORNER): Zone.BOTTOM_CENTRE_LOWER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.PINK_START): Zone.PINK_START,
-    (Zone.LEFT_TRANSITION, Zone.PINK_TOP_CORNER): Zone.PINK_TOP_CORNER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_LEFT_CORNER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_LEFT_LOWER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_CENTRE): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.TOP_RIGHT): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.RIGHT_TRANSITION): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_LEFT_UPPER,
-    (Zone.LEFT_TRANSITION, Zone.YELLOW_START): Zone.TOP_LEFT,
-    (Zone.LEFT_TRANSITION, Zone.YELLOW_TOP_CORNER): Zone.TOP_LEFT,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.RIGHT_TRANSITION, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_TOP_CORNER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_CORNER): Zone.BOTTOM_RIGHT_CORNER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_RIGHT_LOWER): Zone.BOTTOM_RIGHT_LOWER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_CENTRE_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_CENTRE_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_CENTRE): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_LOWER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_UPPER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.TOP_LEFT): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.BOTTOM_LEFT_CORNER): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.LEFT_TRANSITION): Zone.BOTTOM_RIGHT_UPPER,
-    (Zone.RIGHT_TRANSITION, Zone.PINK_START): Zone.TOP_RIGHT,
-    (Zone.RIGHT_TRANSITION, Zone.PINK_TOP_CORNER): Zone.TOP_RIGHT,
-    (Zone.TOP_LEFT, Zone.LEFT_TRANSITION): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.TOP_CENTRE): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.PINK_START): Zone.PINK_START,
-    (Zone.TOP_LEFT, Zone.PINK_TOP_CORNER): Zone.PINK_TOP_CORNER,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_CORNER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_LEFT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.TOP_RIGHT): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.BOTTOM_CENTRE_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_CENTRE_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.RIGHT_TRANSITION): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.YELLOW_START): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.YELLOW_TOP_CORNER): Zone.TOP_CENTRE,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_UPPER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_LOWER): Zone.LEFT_TRANSITION,
-    (Zone.TOP_LEFT, Zone.BOTTOM_RIGHT_CORNER): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.RIGHT_TRANSITION): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.TOP_CENTRE): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.YELLOW_START): Zone.YELLOW_START,
-    (Zone.TOP_RIGHT, Zone.YELLOW_TOP_CORNER): Zone.YELLOW_TOP_CORNER,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_CORNER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_RIGHT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.TOP_LEFT): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_CENTRE_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_CENTRE_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.LEFT_TRANSITION): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.PINK_START): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.PINK_TOP_CORNER): Zone.TOP_CENTRE,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_LOWER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_UPPER): Zone.RIGHT_TRANSITION,
-    (Zone.TOP_RIGHT, Zone.BOTTOM_LEFT_CORNER): Zone.TOP_CENTRE,
-    (Zone.TOP_CENTRE, Zone.TOP_LEFT): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.TOP_RIGHT): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.LEFT_TRANSITION): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.PINK_START): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.PINK_TOP_CORNER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.RIGHT_TRANSITION): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.YELLOW_START): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.YELLOW_TOP_CORNER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_UPPER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_CORNER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_LEFT_LOWER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_UPPER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_CORNER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_RIGHT_LOWER): Zone.TOP_RIGHT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_CENTRE_LOWER): Zone.TOP_LEFT,
-    (Zone.TOP_CENTRE, Zone.BOTTOM_CENTRE_UPPER): Zone.TOP_LEFT,
-}
+
+# Classifies whole sequences of points in one pass, though still one pair of
+# bisections at a time; get_zones_array does the same over numpy arrays
+def get_zones(xs: Iterable[float], ys: Iterable[float]) -> List[Zone]:
+    bisect_left = bisect.bisect_left
+    row_bounds = _ROW_BOUNDS
+    row_zones = _ROW_ZONES
+    columns = map(functools.partial(bisect.bisect_right, _COLUMN_BOUNDS), xs)
+    return [
+        row_zones[column][bisect_left(row_bounds[column], y)]
+        for column, y in zip(columns, ys)
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _zone_arrays() -> Tuple['numpy.ndarray', 'numpy.ndarray', 'numpy.ndarray']:
+    import numpy
+    # Columns with fewer rows are padded with bounds nothing is below
+    width = max(len(bounds) for bounds in _ROW_BOUNDS)
+    row_bounds = numpy.full((len(_ROW_BOUNDS), width), numpy.inf)
+    zones = numpy.empty((len(_ROW_ZONES), width + 1), dtype=object)
+    for column, (bounds, column_zones) in enumerate(zip(_ROW_BOUNDS, _ROW_ZONES)):
+        row_bounds[column, :len(bounds)] = bounds
+        zones[column, :len(column_zones)] = column_zones
+    return numpy.array(_COLUMN_BOUNDS), row_bounds, zones
+
+
+def get_zones_array(xs: 'numpy.typing.ArrayLike', ys: 'numpy.typing.ArrayLike') -> 'numpy.ndarray':
+    # An array of the zone of each point, for offline analysis of many
+    # points at once. Needs numpy, which the robot itself doesn't.
+    import numpy
+    column_bounds, row_bounds, zones = _zone_arrays()
+    xs = numpy.asarray(xs, dtype=float)
+    ys = numpy.asarray(ys, dtype=float)
+    columns = numpy.searchsorted(column_bounds, xs, side='right')
+    # The count of bounds below y, as bisect_left gives
+    rows = numpy.count_nonzero(row_bounds[columns] < ys[..., None], axis=-1)
+    return zones[columns, rows]
+
+
+# Zones which can be driven between directly, before the walls drop
+PRE_DROP_EDGES = (
+    (Zone.PINK_START, Zone.PINK_TOP_CORNER),
+    (Zone.PINK_START, Zone.BOTTOM_LEFT_CORNER),
+    (Zone.YELLOW_START, Zone.BOTTOM_RIGHT_CORNER),
+    (Zone.YELLOW_START, Zone.YELLOW_TOP_CORNER),
+    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_LEFT_LOWER),
+    (Zone.BOTTOM_CENTRE_UPPER, Zone.BOTTOM_RIGHT_LOWER),
+    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_LEFT_LOWER),
+    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_RIGHT_LOWER),
+    (Zone.BOTTOM_LEFT_LOWER, Zone.BOTTOM_LEFT_UPPER),
+    (Zone.BOTTOM_RIGHT_LOWER, Zone.BOTTOM_RIGHT_UPPER),
+    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_LOWER),
+    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_LOWER),
+    (Zone.BOTTOM_LEFT_UPPER, Zone.LEFT_TRANSITION),
+    (Zone.BOTTOM_RIGHT_UPPER, Zone.RIGHT_TRANSITION),
+    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_LOWER),
+    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_LOWER),
+    (Zone.BOTTOM_CENTRE_LOWER, Zone.BOTTOM_CENTRE_UPPER),
+    (Zone.BOTTOM_LEFT_UPPER, Zone.BOTTOM_CENTRE_UPPER),
+    (Zone.BOTTOM_RIGHT_UPPER, Zone.BOTTOM_CENTRE_UPPER),
+    (Zone.LEFT_TRANSITION, Zone.TOP_LEFT),
+    (Zone.RIGHT_TRANSITION, Zone.TOP_RIGHT),
+    (Zone.TOP_LEFT, Zone.TOP_CENTRE),
+    (Zone.TOP_RIGHT, Zone.TOP_CENTRE),
+)
+
+# Additional connections opened up once the walls have dropped
+POST_DROP_EDGES = PRE_DROP_EDGES + (
+    (Zone.PINK_START, Zone.LEFT_TRANSITION),
+    (Zone.PINK_START, Zone.TOP_LEFT),
+    (Zone.PINK_TOP_CORNER, Zone.LEFT_TRANSITION),
+    (Zone.PINK_TOP_CORNER, Zone.TOP_LEFT),
+    (Zone.BOTTOM_LEFT_CORNER, Zone.LEFT_TRANSITION),
+    (Zone.BOTTOM_LEFT_LOWER, Zone.LEFT_TRANSITION),
+    (Zone.BOTTOM_LEFT_CORNER, Zone.BOTTOM_LEFT_UPPER),
+    (Zone.YELLOW_START, Zone.RIGHT_TRANSITION),
+    (Zone.YELLOW_START, Zone.TOP_RIGHT),
+    (Zone.YELLOW_TOP_CORNER, Zone.RIGHT_TRANSITION),
+    (Zone.YELLOW_TOP_CORNER, Zone.TOP_RIGHT),
+    (Zone.BOTTOM_RIGHT_CORNER, Zone.RIGHT_TRANSITION),
+    (Zone.BOTTOM_RIGHT_LOWER, Zone.RIGHT_TRANSITION),
+    (Zone.BOTTOM_RIGHT_CORNER, Zone.BOTTOM_RIGHT_UPPER),
+)
 
 
-for zone in Zone:
-    if get_zone(ZONE_CENTRES[zone]) != zone:
-        raise AssertionError(f"{zone} centre point is not inside zone")
+ZoneGraph = Dict[Zone, Dict[Zone, float]]
+
+
+def build_zone_graph(edges: Iterable[Tuple[Zone, Zone]]) -> ZoneGraph:
+    graph: ZoneGraph = {zone: {} for zone in Zone}
+    for a, b in edges:
+        distance = math.hypot(
+            ZONE_CENTRES[a].x - ZONE_CENTRES[b].x,
+            ZONE_CENTRES[a].y - ZONE_CENTRES[b].y,
+        )
+        graph[a][b] = distance
+        graph[b][a] = distance
+    return graph
+
+
+def build_routing_tables(
+    graph: ZoneGraph,
+) -> Tuple[Dict[Tuple[Zone, Zone], Zone], Dict[Tuple[Zone, Zone], float]]:
+    # Dijkstra from every zone, weighted by centre-to-centre distance. The
+    # counter breaks ties in declaration order so the tables are stable.
+    next_hops = {}
+    lengths = {}
+    order = {zone: index for index, zone in enumerate(Zone)}
+    for origin in Zone:
+        distances = {origin: 0.0}
+        first_hops = {origin: origin}
+        queue = [(0.0, order[origin], origin)]
+        visited = set()
+        while queue:
+            distance, _, zone = heapq.heappop(queue)
+            if zone in visited:
+                continue
+            visited.add(zone)
+            if zone != origin:
+                next_hops[origin, zone] = first_hops[zone]
+                lengths[origin, zone] = distance
+            for neighbour, edge_length in graph[zone].items():
+                candidate = distance + edge_length
+                if candidate < distances.get(neighbour, math.inf):
+                    distances[neighbour] = candidate
+                    first_hops[neighbour] = neighbour if zone == origin else first_hops[zone]
+                    heapq.heappush(queue, (candidate, order[neighbour], neighbour))
+    return next_hops, lengths
+
+
+# A route between zones which aren't directly routable: the first zone centre
+# to head for, the length of the centre-to-centre path from there to the last
+# centre visited, and that last centre, from which the destination is direct.
+RouteLeg = Tuple[Location, float, Location]
+
+
+def build_route_legs(
+    routing_table: Dict[Tuple[Zone, Zone], Zone],
+) -> Dict[Tuple[Zone, Zone], RouteLeg]:
+    legs = {}
+    for (origin, destination), first_hop in routing_table.items():
+        if first_hop == destination:
+            continue
+        hop = first_hop
+        length = 0.0
+        while True:
+            next_hop = routing_table[hop, destination]
+            if next_hop == destination:
+                break
+            length += math.hypot(
+                ZONE_CENTRES[next_hop].x - ZONE_CENTRES[hop].x,
+                ZONE_CENTRES[next_hop].y - ZONE_CENTRES[hop].y,
+            )
+            hop = next_hop
+        legs[origin, destination] = (ZONE_CENTRES[first_hop], length, ZONE_CENTRES[hop])
+    return legs
+
+
+RoutingTables = Tuple[
+    Dict[Tuple[Zone, Zone], Zone],
+    Dict[Tuple[Zone, Zone], float],
+    Dict[Tuple[Zone, Zone], RouteLeg],
+]
+
+
+@functools.lru_cache(maxsize=None)
+def routing_tables(dropped: bool) -> RoutingTables:
+    # Next hops, route lengths and route legs for before or after the drop,
+    # built the first time each is needed rather than at import
+    next_hops, lengths = build_routing_tables(build_zone_graph(POST_DROP_EDGES if dropped else PRE_DROP_EDGES))
+    if SELF_CHECK and len(next_hops) != len(Zone) * (len(Zone) - 1):
+        raise AssertionError("navmesh graph is not connected")
+    return next_hops, lengths, build_route_legs(next_hops)
+
+
+def check_zone_centres() -> None:
+    for zone in Zone:
+        if get_zone(ZONE_CENTRES[zone]) != zone:
+            raise AssertionError(f"{zone} centre point is not inside zone")
+
+
+if SELF_CHECK:
+    check_zone_centres()
+    for dropped in (False, True):
+        routing_tables(dropped)
 
 
 def get_next_hop(from_zone: Zone, to_loc: Location, dropped: bool) -> Tuple[Zone, bool]:
@@ -690,7 +357,7 @@ def get_next_hop(from_zone: Zone, to_loc: Location, dropped: bool) -> Tuple[Zone
     if from_zone == to_zone:
         return to_zone, True
 
-    routing_table = ROUTING_POST_DROP if dropped else ROUTING_PRE_DROP
+    routing_table, _, _ = routing_tables(dropped)
 
     next_hop = routing_table[from_zone, to_zone]
     return next_hop, next_hop == to_zone
@@ -698,3 +365,16 @@ def get_next_hop(from_zone: Zone, to_loc: Location, dropped: bool) -> Tuple[Zone
 
 def is_direct_routable(from_zone: Zone, to_loc: Location, dropped: bool) -> bool:
     return get_next_hop(from_zone, to_loc, dropped)[1]
+
+
+def get_route_length(from_zone: Zone, to_zone: Zone, dropped: bool) -> float:
+    if from_zone == to_zone:
+        return 0.0
+    _, lengths, _ = routing_tables(dropped)
+    return lengths[from_zone, to_zone]
+
+
+def get_route_leg(from_zone: Zone, to_zone: Zone, dropped: bool) -> Optional[RouteLeg]:
+    # None where the destination is directly routable
+    _, _, legs = routing_tables(dropped)
+    return legs.get((from_zone, to_zone))
@@ -0,0 +1,96 @@
+import math
+from typing import List, Optional, Sequence
+
+from sr.robot.radio import Target
+
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.stations import STATION_BITS
+
+
+# The other robot has to be about this close to a station to claim it
+OPPONENT_CLAIM_RANGE = 0.6
+# Assumed top speed of the other robot, which bounds how far it can have gone
+# since we last placed it
+OPPONENT_SPEED = 0.5
+# Once we can only say it's somewhere within a circle wider than this, the
+# estimate is spread too thin to count for much anywhere
+LOCALISED_RADIUS = 1.5
+
+_STATION_INDEX = {station: bit.bit_length() - 1 for station, bit in STATION_BITS.items()}
+_STATION_XS = [STATION_CODE_LOCATIONS[station].x for station in STATION_BITS]
+_STATION_YS = [STATION_CODE_LOCATIONS[station].y for station in STATION_BITS]
+
+
+# Rough, decaying estimate of where the other robot is, from the only evidence
+# we have of it: stations changing hands to the other side between sweeps. A
+# flip means it was within claiming range of that station at some point since
+# we last saw the station's owner, so the longer that gap the less we know.
+# The estimate is a circle whose radius grows at the opponent's top speed and
+# shrinks as new flips are fused in.
+class OpponentTracker:
+    def __init__(self, zone: int, start_time: float) -> None:
+        self.zone = zone
+        self.start_time = start_time
+        # Stations we've seen the other side holding, and when we last saw
+        # each station's owner at all
+        self.theirs_mask = 0
+        self.last_seen: List[float] = [start_time] * len(STATION_BITS)
+        self.x = 0.0
+        self.y = 0.0
+        self.radius = math.inf
+        self.time = -math.inf
+        self.flips = 0
+
+    def observe(self, targets: Sequence[Target], time: float) -> None:
+        for target in targets:
+            info = target.target_info
+            index = _STATION_INDEX[info.station_code]
+            bit = 1 << index
+            owner = info.owned_by
+            if owner is not None and owner != self.zone:
+                if not self.theirs_mask & bit:
+                    self.theirs_mask |= bit
+                    self._fuse(index, self.last_seen[index], time)
+            else:
+                self.theirs_mask &= ~bit
+            self.last_seen[index] = time
+
+    def _fuse(self, index: int, since: float, time: float) -> None:
+        self.flips += 1
+        # Where it could be now, given it claimed somewhere in (since, time]
+        radius = OPPONENT_CLAIM_RANGE + OPPONENT_SPEED * (time - since)
+        x = _STATION_XS[index]
+        y = _STATION_YS[index]
+        prior = self.radius_at(time)
+        if math.isinf(prior):
+            self.x, self.y, self.radius = x, y, radius
+        else:
+            # Treat both circles as isotropic Gaussians and take the product
+            gain = prior ** 2 / (prior ** 2 + radius ** 2)
+            self.x += gain * (x - self.x)
+            self.y += gain * (y - self.y)
+            self.radius = prior * math.sqrt(1 - gain)
+        self.time = time
+
+    def radius_at(self, time: float) -> float:
+        if math.isinf(self.time):
+            return math.inf
+        return self.radius + OPPONENT_SPEED * max(0.0, time - self.time)
+
+    @property
+    def location(self) -> Optional[Location]:
+        if math.isinf(self.time):
+            return None
+        return Location(x=self.x, y=self.y)
+
+    def presence(self, location: Location, time: float) -> float:
+        # How much to believe the opponent is around the given location, from
+        # 0 to 1, fading out as the circle grows with time
+        if math.isinf(self.time):
+            return 0.0
+        radius = self.radius_at(time)
+        distance_squared = (location.x - self.x) ** 2 + (location.y - self.y) ** 2
+        return (
+            min(1.0, (LOCALISED_RADIUS / radius) ** 2) *
+            math.exp(-0.5 * distance_squared / radius ** 2)
+        )
@@ -0,0 +1,184 @@
+import math
+from typing import Optional, Sequence
+
+import numpy
+
+from sr.robot import StationCode
+from sr.robot.radio import Target
+
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.kalman import MOTOR_LINEAR_SPEED, MOTOR_LINEAR_SPEED_STDEV, LEVER_ARM
+from albot.ekf import (
+    INITIAL_LOCATION_STDEV,
+    INITIAL_HEADING_STDEV,
+    WHEEL_SPEED_STDEV_FLOOR,
+    POSITION_DRIFT_PER_SQRT_SECOND,
+    HEADING_DRIFT_PER_SQRT_SECOND,
+    COMPASS_STDEV,
+    RADIO_BEARING_STDEV,
+    RADIO_DISTANCE_STDEV,
+    RADIO_DISTANCE_STDEV_PER_METRE,
+)
+
+
+PARTICLE_COUNT = 2000
+# Resample once the effective sample size drops below this fraction
+RESAMPLE_THRESHOLD = 0.5
+# If no particle is within this many standard deviations of a measurement on
+# average, assume we've been knocked or spun and redraw from the measurement
+RESET_STDEVS = 4
+
+_STATION_INDEX = {station: index for index, station in enumerate(StationCode)}
+_STATION_POSITIONS = numpy.array([
+    [STATION_CODE_LOCATIONS[station].x, STATION_CODE_LOCATIONS[station].y]
+    for station in StationCode
+])
+
+
+# Particle filter over (x, y, heading), for where the pose distribution is
+# multimodal. Exposes the same accessors as KalmanFilter so it can stand in
+# for it; the reported pose is the weighted mean of the particles.
+class ParticleFilter:
+    def __init__(
+        self,
+        initial_position: Location,
+        initial_heading: float,
+        count: int = PARTICLE_COUNT,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.count = count
+        self.rng = numpy.random.default_rng(seed)
+        self.xs = self.rng.normal(initial_position.x, INITIAL_LOCATION_STDEV, count)
+        self.ys = self.rng.normal(initial_position.y, INITIAL_LOCATION_STDEV, count)
+        self.theta = self.rng.normal(initial_heading, INITIAL_HEADING_STDEV, count) % math.tau
+        self.log_weights = numpy.zeros(count)
+        self.weights = numpy.full(count, 1 / count)
+        self._summarise()
+
+    @property
+    def location(self) -> Location:
+        return Location(x=self.x, y=self.y)
+
+    def tick(self, dt: float, left_power: float, right_power: float) -> None:
+        if dt <= 0:
+            return
+        count = self.count
+        normal = self.rng.standard_normal
+        left_stdev = max(WHEEL_SPEED_STDEV_FLOOR, MOTOR_LINEAR_SPEED_STDEV * abs(left_power) / 100)
+        right_stdev = max(WHEEL_SPEED_STDEV_FLOOR, MOTOR_LINEAR_SPEED_STDEV * abs(right_power) / 100)
+        left_velocity = MOTOR_LINEAR_SPEED * left_power / 100 + left_stdev * normal(count)
+        right_velocity = MOTOR_LINEAR_SPEED * right_power / 100 + right_stdev * normal(count)
+        surge = (left_velocity + right_velocity) * 0.5
+        rotation = (left_velocity - right_velocity) / LEVER_ARM
+
+        position_drift = POSITION_DRIFT_PER_SQRT_SECOND * math.sqrt(dt)
+        self.xs += surge * numpy.sin(self.theta) * dt + position_drift * normal(count)
+        self.ys += surge * numpy.cos(self.theta) * dt + position_drift * normal(count)
+        self.theta += rotation * dt + HEADING_DRIFT_PER_SQRT_SECOND * math.sqrt(dt) * normal(count)
+        self.theta %= math.tau
+        self._summarise()
+
+    def update_heading(self, compass: float) -> None:
+        error = (compass - self.theta + math.pi) % math.tau - math.pi
+        squared_error = (error / COMPASS_STDEV) ** 2
+        if squared_error.min() > RESET_STDEVS ** 2:
+            self.theta = (compass + COMPASS_STDEV * self.rng.standard_normal(self.count)) % math.tau
+            self._summarise()
+            return
+        self.log_weights -= 0.5 * squared_error
+        self._normalise()
+
+    def update_location(self, location: Location, stdev: float) -> None:
+        self.log_weights -= 0.5 * ((self.xs - location.x) ** 2 + (self.ys - location.y) ** 2) / stdev ** 2
+        self._normalise()
+
+    def update_targets(self, targets: Sequence[Target]) -> None:
+        if not targets:
+            return
+        indices = numpy.fromiter(
+            (_STATION_INDEX[target.target_info.station_code] for target in targets),
+            dtype=numpy.intp,
+            count=len(targets),
+        )
+        signal_strengths = numpy.fromiter(
+            (target.signal_strength for target in targets),
+            dtype=float,
+            count=len(targets),
+        )
+        bearings = numpy.fromiter(
+            (target.bearing for target in targets),
+            dtype=float,
+            count=len(targets),
+        )
+        stations = _STATION_POSITIONS[indices]
+        measured_distance = signal_strengths ** -0.5
+        distance_stdev = RADIO_DISTANCE_STDEV + RADIO_DISTANCE_STDEV_PER_METRE * measured_distance
+
+        # Particles by targets
+        dx = stations[:, 0] - self.xs[:, None]
+        dy = stations[:, 1] - self.ys[:, None]
+        distance_error = (numpy.hypot(dx, dy) - measured_distance) / distance_stdev
+        bearing_error = (
+            (bearings - (numpy.arctan2(dx, dy) - self.theta[:, None]) + math.pi) % math.tau - math.pi
+        ) / RADIO_BEARING_STDEV
+        squared_error = (distance_error ** 2 + bearing_error ** 2).sum(axis=1)
+        if squared_error.min() > 2 * len(targets) * RESET_STDEVS ** 2:
+            self._reset_from_targets(stations, measured_distance, distance_stdev, bearings)
+            return
+        self.log_weights -= 0.5 * squared_error
+        self._normalise()
+
+    def _reset_from_targets(
+        self,
+        stations: numpy.ndarray,
+        measured_distance: numpy.ndarray,
+        distance_stdev: numpy.ndarray,
+        bearings: numpy.ndarray,
+    ) -> None:
+        # Place each particle by a fix from one randomly chosen target, keeping
+        # its heading, as in single_target_position
+        normal = self.rng.standard_normal
+        choice = self.rng.integers(len(stations), size=self.count)
+        distance = measured_distance[choice] + distance_stdev[choice] * normal(self.count)
+        absolute_bearing = self.theta + bearings[choice] + RADIO_BEARING_STDEV * normal(self.count)
+        self.xs = stations[choice, 0] - distance * numpy.sin(absolute_bearing)
+        self.ys = stations[choice, 1] - distance * numpy.cos(absolute_bearing)
+        self.log_weights = numpy.zeros(self.count)
+        self.weights = numpy.full(self.count, 1 / self.count)
+        self._summarise()
+
+    def _normalise(self) -> None:
+        self.log_weights -= self.log_weights.max()
+        weights = numpy.exp(self.log_weights)
+        weights /= weights.sum()
+        self.weights = weights
+        effective_sample_size = 1 / numpy.dot(weights, weights)
+        if effective_sample_size < RESAMPLE_THRESHOLD * self.count:
+            self._resample(weights)
+        self._summarise()
+
+    def _resample(self, weights: numpy.ndarray) -> None:
+        # Systematic resampling
+        positions = (self.rng.random() + numpy.arange(self.count)) / self.count
+        cumulative = numpy.cumsum(weights)
+        cumulative[-1] = 1.0
+        indices = numpy.searchsorted(cumulative, positions)
+        self.xs = self.xs[indices]
+        self.ys = self.ys[indices]
+        self.theta = self.theta[indices]
+        self.log_weights = numpy.zeros(self.count)
+        self.weights = numpy.full(self.count, 1 / self.count)
+
+    def _summarise(self) -> None:
+        weights = self.weights
+        self.x = float(numpy.dot(weights, self.xs))
+        self.y = float(numpy.dot(weights, self.ys))
+        self.location_error = math.sqrt(
+            float(numpy.dot(weights, (self.xs - self.x) ** 2 + (self.ys - self.y) ** 2))
+        )
+        sin_mean = float(numpy.dot(weights, numpy.sin(self.theta)))
+        cos_mean = float(numpy.dot(weights, numpy.cos(self.theta)))
+        self.heading = math.atan2(sin_mean, cos_mean) % math.tau
+        # Circular standard deviation
+        resultant = min(1.0, math.hypot(sin_mean, cos_mean))
+        self.heading_error = math.sqrt(-2 * math.log(max(resultant, 1e-12)))
@@ -0,0 +1,392 @@
+import math
+import heapq
+import functools
+from typing import List, Optional, Sequence, Tuple
+
+from sr.robot import StationCode
+
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.navmesh import (
+    Zone,
+    ARENA_HALF_LENGTH,
+    ARENA_HALF_WIDTH,
+    ROBOT_RADIUS,
+    TOWER_RADIUS,
+    PRE_DROP_EDGES,
+    POST_DROP_EDGES,
+    OPTIMAL_CAPTURE_ANGLES,
+    capture_point,
+    get_zones,
+)
+
+
+# Occupancy grid over the arena. Towers are inflated by the robot's radius so
+# the robot can be planned as a point, and the navmesh supplies the walls: a
+# path may only cross between cells in the same zone or in zones the navmesh
+# connects directly.
+GRID_RESOLUTION = 0.1
+GRID_COLUMNS = round(2 * ARENA_HALF_LENGTH / GRID_RESOLUTION)
+GRID_ROWS = round(2 * ARENA_HALF_WIDTH / GRID_RESOLUTION)
+
+# Cells within this distance of a wall cost extra to cross, keeping paths off
+# the walls without closing any gaps
+WALL_CLEARANCE = 0.3
+WALL_PENALTY = 2.0
+# Likewise for cells this close to the edge of a tower's inflated footprint,
+# which leaves room for path following to cut corners
+TOWER_CLEARANCE = 0.2
+TOWER_PENALTY = 2.0
+# A station is reached from anywhere within this range of it, which is inside
+# the range at which we start claiming
+GOAL_RADIUS = 0.45
+# Stations with an optimal capture angle are instead reached within this range
+# of the point lined up on it, as GotoStation heads for
+CAPTURE_POINT_RADIUS = 0.15
+# How far to search for a reachable cell when the pose estimate is inside an
+# obstacle
+RECOVERY_RADIUS = 0.5
+# Slack allowed when shortcutting a path, to absorb the grid's discretisation
+SMOOTHING_TOLERANCE = 0.2
+SMOOTHING_STRIDE = 2
+# Waypoints are looked for no further than this along the path, which bounds
+# the cost of a query
+SMOOTHING_LOOKAHEAD = 3.0
+
+_DIAGONAL = math.sqrt(2)
+_NEIGHBOURS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, _DIAGONAL), (1, -1, _DIAGONAL), (-1, 1, _DIAGONAL), (-1, -1, _DIAGONAL),
+)
+
+Grid = Tuple[Sequence[bool], Sequence[float], Sequence[Sequence[Tuple[int, float]]]]
+DistanceField = Sequence[float]
+
+
+def cell_centre(cell: int) -> Location:
+    row, column = divmod(cell, GRID_COLUMNS)
+    return Location(
+        x=-ARENA_HALF_LENGTH + (column + 0.5) * GRID_RESOLUTION,
+        y=-ARENA_HALF_WIDTH + (row + 0.5) * GRID_RESOLUTION,
+    )
+
+
+def cell_at(x: float, y: float) -> int:
+    column = min(GRID_COLUMNS - 1, max(0, int((x + ARENA_HALF_LENGTH) / GRID_RESOLUTION)))
+    row = min(GRID_ROWS - 1, max(0, int((y + ARENA_HALF_WIDTH) / GRID_RESOLUTION)))
+    return row * GRID_COLUMNS + column
+
+
+# Per-cell tables: the centre of each cell, the index of the zone it's in,
+# and whether it's clear of the walls and towers. Built on first use rather
+# than at import, since they take a while.
+Cells = Tuple[Sequence[Location], Sequence[int], Sequence[bool]]
+
+_ZONE_INDICES = {zone: index for index, zone in enumerate(Zone)}
+_ZONE_COUNT = len(_ZONE_INDICES)
+
+
+def _cells_near(location: Location, radius: float) -> List[int]:
+    # Cells whose centres are within the radius of the location
+    first_column = max(0, math.floor((location.x - radius + ARENA_HALF_LENGTH) / GRID_RESOLUTION) - 1)
+    last_column = min(GRID_COLUMNS - 1, math.ceil((location.x + radius + ARENA_HALF_LENGTH) / GRID_RESOLUTION))
+    first_row = max(0, math.floor((location.y - radius + ARENA_HALF_WIDTH) / GRID_RESOLUTION) - 1)
+    last_row = min(GRID_ROWS - 1, math.ceil((location.y + radius + ARENA_HALF_WIDTH) / GRID_RESOLUTION))
+    cells = []
+    for row in range(first_row, last_row + 1):
+        y = -ARENA_HALF_WIDTH + (row + 0.5) * GRID_RESOLUTION
+        for column in range(first_column, last_column + 1):
+            x = -ARENA_HALF_LENGTH + (column + 0.5) * GRID_RESOLUTION
+            if math.hypot(x - location.x, y - location.y) <= radius:
+                cells.append(row * GRID_COLUMNS + column)
+    return cells
+
+
+@functools.lru_cache(maxsize=None)
+def _cells() -> Cells:
+    centres = [cell_centre(cell) for cell in range(GRID_COLUMNS * GRID_ROWS)]
+    zone_indices = _ZONE_INDICES
+    zones = [zone_indices[x] for x in get_zones((x.x for x in centres), (x.y for x in centres))]
+    free = [
+        abs(centre.x) <= ARENA_HALF_LENGTH - ROBOT_RADIUS and
+        abs(centre.y) <= ARENA_HALF_WIDTH - ROBOT_RADIUS
+        for centre in centres
+    ]
+    for station in STATION_CODE_LOCATIONS.values():
+        for cell in _cells_near(station, TOWER_RADIUS + ROBOT_RADIUS):
+            free[cell] = False
+    return centres, zones, free
+
+
+@functools.lru_cache(maxsize=None)
+def _connected_zones(dropped: bool) -> bytes:
+    # Flattened matrix, indexed by from_zone * _ZONE_COUNT + to_zone
+    edges = POST_DROP_EDGES if dropped else PRE_DROP_EDGES
+    connected = bytearray(_ZONE_COUNT * _ZONE_COUNT)
+    for index in range(_ZONE_COUNT):
+        connected[index * _ZONE_COUNT + index] = 1
+    for a, b in edges:
+        a, b = _ZONE_INDICES[a], _ZONE_INDICES[b]
+        connected[a * _ZONE_COUNT + b] = 1
+        connected[b * _ZONE_COUNT + a] = 1
+    return bytes(connected)
+
+
+@functools.lru_cache(maxsize=None)
+def build_grid(dropped: bool) -> Grid:
+    # Free cells, the cost weight of each cell, and each cell's passable
+    # neighbours with the cost of moving to them
+    _, zones, free = _cells()
+    connected = _connected_zones(dropped)
+    cell_count = GRID_COLUMNS * GRID_ROWS
+
+    # Cells on the edge of a wall, dilated by the clearance
+    wall_cells = [
+        cell
+        for cell in range(cell_count)
+        if any(
+            not connected[zones[cell] * _ZONE_COUNT + zones[neighbour]]
+            for neighbour in _orthogonal_neighbours(cell)
+        )
+    ]
+    reach = math.ceil(WALL_CLEARANCE / GRID_RESOLUTION)
+    offsets = [
+        (dx, dy)
+        for dx in range(-reach, reach + 1)
+        for dy in range(-reach, reach + 1)
+        if math.hypot(dx, dy) * GRID_RESOLUTION <= WALL_CLEARANCE
+    ]
+    weights = [1.0] * cell_count
+    for cell in wall_cells:
+        row, column = divmod(cell, GRID_COLUMNS)
+        for dx, dy in offsets:
+            if 0 <= column + dx < GRID_COLUMNS and 0 <= row + dy < GRID_ROWS:
+                weights[(row + dy) * GRID_COLUMNS + column + dx] = WALL_PENALTY
+
+    for station in STATION_CODE_LOCATIONS.values():
+        for cell in _cells_near(station, TOWER_RADIUS + ROBOT_RADIUS + TOWER_CLEARANCE):
+            weights[cell] = max(weights[cell], TOWER_PENALTY)
+
+    neighbours: List[List[Tuple[int, float]]] = []
+    for cell in range(cell_count):
+        row, column = divmod(cell, GRID_COLUMNS)
+        cell_neighbours = []
+        if free[cell]:
+            row_offset = zones[cell] * _ZONE_COUNT
+            for dx, dy, step in _NEIGHBOURS:
+                if not (0 <= column + dx < GRID_COLUMNS and 0 <= row + dy < GRID_ROWS):
+                    continue
+                neighbour = (row + dy) * GRID_COLUMNS + column + dx
+                if not (free[neighbour] and connected[row_offset + zones[neighbour]]):
+                    continue
+                if dx and dy:
+                    # No cutting corners past obstacles or walls
+                    side_a = row * GRID_COLUMNS + column + dx
+                    side_b = (row + dy) * GRID_COLUMNS + column
+                    zone_neighbour = zones[neighbour]
+                    zone_a = zones[side_a]
+                    zone_b = zones[side_b]
+                    if not (
+                        free[side_a] and connected[row_offset + zone_a] and
+                        connected[zone_a * _ZONE_COUNT + zone_neighbour] and
+                        free[side_b] and connected[row_offset + zone_b] and
+                        connected[zone_b * _ZONE_COUNT + zone_neighbour]
+                    ):
+                        continue
+                cost = step * GRID_RESOLUTION * (weights[cell] + weights[neighbour]) / 2
+                cell_neighbours.append((neighbour, cost))
+        neighbours.append(cell_neighbours)
+    return free, weights, neighbours
+
+
+def _orthogonal_neighbours(cell: int) -> List[int]:
+    row, column = divmod(cell, GRID_COLUMNS)
+    return [
+        (row + dy) * GRID_COLUMNS + column + dx
+        for dx, dy, _ in _NEIGHBOURS[:4]
+        if 0 <= column + dx < GRID_COLUMNS and 0 <= row + dy < GRID_ROWS
+    ]
+
+
+def goal_cells(station: StationCode) -> List[int]:
+    _, _, free = _cells()
+    cells = [
+        cell
+        for cell in _cells_near(STATION_CODE_LOCATIONS[station], GOAL_RADIUS)
+        if free[cell]
+    ]
+    if station in OPTIMAL_CAPTURE_ANGLES:
+        # Still within claiming range, where that leaves any cells free
+        lined_up = set(_cells_near(capture_point(station), CAPTURE_POINT_RADIUS)).intersection(cells)
+        if lined_up:
+            return sorted(lined_up)
+    return cells
+
+
+@functools.lru_cache(maxsize=None)
+def distance_field(station: StationCode, dropped: bool) -> DistanceField:
+    # Cost to reach the station from every cell, by Dijkstra outward from the
+    # cells around it. Moves cost the same in both directions, so this is also
+    # the cost from each cell to the station.
+    _, _, neighbours = build_grid(dropped)
+    distances = [math.inf] * len(neighbours)
+    queue = []
+    for cell in goal_cells(station):
+        distances[cell] = 0.0
+        queue.append((0.0, cell))
+    heapq.heapify(queue)
+    while queue:
+        distance, cell = heapq.heappop(queue)
+        if distance > distances[cell]:
+            continue
+        for neighbour, cost in neighbours[cell]:
+            candidate = distance + cost
+            if candidate < distances[neighbour]:
+                distances[neighbour] = candidate
+                heapq.heappush(queue, (candidate, neighbour))
+    return distances
+
+
+def precompute_distance_fields(dropped: bool) -> None:
+    # Each field takes a few tens of milliseconds, too long to build on a
+    # control tick when a station first becomes a target
+    for station in StationCode:
+        distance_field(station, dropped)
+
+
+def _start_cell(location: Location, field: DistanceField) -> Optional[int]:
+    # The cell under the robot, or the nearest reachable one if the estimate
+    # has us inside a tower's clearance or behind a wall
+    cell = cell_at(location.x, location.y)
+    if field[cell] < math.inf:
+        return cell
+    row, column = divmod(cell, GRID_COLUMNS)
+    reach = math.ceil(RECOVERY_RADIUS / GRID_RESOLUTION)
+    candidates = [
+        (math.hypot(dx, dy), (row + dy) * GRID_COLUMNS + column + dx)
+        for dx in range(-reach, reach + 1)
+        for dy in range(-reach, reach + 1)
+        if 0 <= column + dx < GRID_COLUMNS and 0 <= row + dy < GRID_ROWS
+    ]
+    candidates.sort()
+    for _, candidate in candidates:
+        if field[candidate] < math.inf:
+            return candidate
+    return None
+
+
+def _descend(cell: int, field: DistanceField, neighbours: Sequence[Sequence[Tuple[int, float]]]) -> int:
+    best = cell
+    for neighbour, _ in neighbours[cell]:
+        if field[neighbour] < field[best]:
+            best = neighbour
+    return best
+
+
+def _segment_cost(start: Location, end: Location, dropped: bool) -> float:
+    # Weighted length of the straight line between two points, or infinity if
+    # it passes through an obstacle or a wall
+    free, weights, _ = build_grid(dropped)
+    connected = _connected_zones(dropped)
+    _, zones, _ = _cells()
+    dx = end.x - start.x
+    dy = end.y - start.y
+    length = math.hypot(dx, dy)
+    steps = max(1, math.ceil(length / (GRID_RESOLUTION / 2)))
+    step_length = length / steps
+    # Sample in grid units, offset so that truncation gives the cell
+    x = (start.x + ARENA_HALF_LENGTH) / GRID_RESOLUTION
+    y = (start.y + ARENA_HALF_WIDTH) / GRID_RESOLUTION
+    step_x = dx / GRID_RESOLUTION / steps
+    step_y = dy / GRID_RESOLUTION / steps
+    last_column = GRID_COLUMNS - 1
+    last_row = GRID_ROWS - 1
+    previous = cell_at(start.x, start.y)
+    cost = 0.0
+    for _ in range(steps):
+        x += step_x
+        y += step_y
+        cell = (
+            min(last_row, max(0, int(y))) * GRID_COLUMNS +
+            min(last_column, max(0, int(x)))
+        )
+        if cell == previous:
+            cost += step_length * weights[cell]
+            continue
+        if not free[cell] or not connected[zones[previous] * _ZONE_COUNT + zones[cell]]:
+            return math.inf
+        cost += step_length * weights[cell]
+        previous = cell
+    return cost
+
+
+def _next_waypoint_from(
+    location: Location,
+    cell: int,
+    field: DistanceField,
+    dropped: bool,
+) -> Location:
+    # Follow the distance field down from the start cell and take the furthest
+    # cell which can be reached in a straight line for no more than the cost
+    # of following the field
+    _, _, neighbours = build_grid(dropped)
+    centres, _, _ = _cells()
+    budget = field[cell] + SMOOTHING_TOLERANCE
+    horizon = field[cell] - SMOOTHING_LOOKAHEAD
+    # Always make at least one step of progress
+    cell = _descend(cell, field, neighbours)
+    waypoint = centres[cell]
+    steps = 0
+    while field[cell] > 0 and field[cell] > horizon:
+        following = _descend(cell, field, neighbours)
+        if following == cell:
+            break
+        cell = following
+        steps += 1
+        if steps % SMOOTHING_STRIDE and field[cell] > 0:
+            continue
+        if _segment_cost(location, centres[cell], dropped) + field[cell] > budget:
+            break
+        waypoint = centres[cell]
+    return waypoint
+
+
+def distance_to_station(location: Location, station: StationCode, dropped: bool) -> float:
+    field = distance_field(station, dropped)
+    cell = _start_cell(location, field)
+    if cell is None:
+        return math.inf
+    return field[cell]
+
+
+@functools.lru_cache(maxsize=65536)
+def _next_waypoint_for_cell(cell: int, station: StationCode, dropped: bool) -> Location:
+    return _next_waypoint_from(cell_centre(cell), cell, distance_field(station, dropped), dropped)
+
+
+def next_waypoint(location: Location, station: StationCode, dropped: bool) -> Optional[Location]:
+    # Where to head next towards the station, or None if there's no path.
+    # Planned from the centre of the cell we're in, so repeated queries from
+    # around the same place are lookups.
+    field = distance_field(station, dropped)
+    cell = _start_cell(location, field)
+    if cell is None:
+        return None
+    return _next_waypoint_for_cell(cell, station, dropped)
+
+
+def plan_path(location: Location, station: StationCode, dropped: bool) -> Optional[List[Location]]:
+    # Smoothed waypoints from the location to the station, not including the
+    # starting point. Each leg is planned from the cell the previous one ended
+    # in, so successive plans along the way share most of their work.
+    field = distance_field(station, dropped)
+    cell = _start_cell(location, field)
+    if cell is None:
+        return None
+    path = []
+    while True:
+        waypoint = _next_waypoint_for_cell(cell, station, dropped)
+        path.append(waypoint)
+        next_cell = cell_at(waypoint.x, waypoint.y)
+        if field[next_cell] == 0 or next_cell == cell:
+            return path
+        cell = next_cell
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Optional
 
 
 class PIDController:
@@ -37,3 +37,72 @@ class PIDController:
             return 1.0
         return total
 
+
+# Sample period for DiscretePIDController, and the longest gap between calls
+# it will integrate over; after a longer gap it starts afresh
+SAMPLE_TIME = 0.01
+MAX_CATCH_UP_TIME = 1.0
+# The derivative is low-pass filtered with a time constant of the prediction
+# time divided by this
+DERIVATIVE_FILTER_DIVISOR = 8
+
+
+class DiscretePIDController:
+    # Same tuning parameters as PIDController, but stepped at a fixed sample
+    # time with a filtered derivative. The integral only accumulates while the
+    # output isn't saturated in the direction of the error.
+    def __init__(
+        self,
+        full_deflection_error: float,
+        prediction_time: float,
+        fine_tune_time: float,
+        time: Callable[[], float],
+        sample_time: float = SAMPLE_TIME,
+    ) -> None:
+        self.time = time
+        self.sample_time = sample_time
+        self.kp = 1 / full_deflection_error
+        self.kd = prediction_time / full_deflection_error
+        self.ki = 1 / (fine_tune_time * full_deflection_error)
+        self.filter_time = prediction_time / DERIVATIVE_FILTER_DIVISOR
+        self.max_catch_up_steps = max(1, round(MAX_CATCH_UP_TIME / sample_time))
+        self.reset()
+
+    def reset(self) -> None:
+        self.t = self.time()
+        self.last_error: Optional[float] = None
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.output = 0.0
+
+    def step(self, error: float) -> float:
+        now = self.time()
+        elapsed = now - self.t
+        steps = int(elapsed / self.sample_time)
+        if self.last_error is None or steps > self.max_catch_up_steps:
+            # First call, or we haven't been stepped for a while: the old
+            # error and derivative are stale
+            self.t = now
+            self.last_error = error
+            self.derivative = 0.0
+            self.output = self._output(error)
+            return self.output
+        if steps == 0:
+            return self.output
+        # Hold the error across each sample period that has passed, keeping
+        # the remainder for next time
+        self.t += steps * self.sample_time
+        dt = self.sample_time
+        smoothing = self.filter_time / (self.filter_time + dt)
+        gain = self.kd / (self.filter_time + dt)
+        for _ in range(steps):
+            self.derivative = smoothing * self.derivative + gain * (error - self.last_error)
+            self.last_error = error
+            unsaturated = self.kp * error + self.integral + self.derivative
+            if -1.0 < unsaturated < 1.0 or (unsaturated > 0) != (error > 0):
+                self.integral += self.ki * error * dt
+        self.output = self._output(error)
+        return self.output
+
+    def _output(self, error: float) -> float:
+        return max(-1.0, min(1.0, self.kp * error + self.integral + self.derivative))
@@ -1,11 +1,15 @@
 from sr.robot import StationCode, Claimant
 from albot.view import STATION_CODE_LOCATIONS, Location
 from albot.nerf import NERF_MODE
-from albot.navmesh import get_zone, is_direct_routable, get_next_hop, ZONE_CENTRES
-from typing import Mapping, Sequence, Optional, Set
+from albot.navmesh import get_zone, get_route_leg
+from albot.kalman import MOTOR_LINEAR_SPEED
+from albot.stations import STATION_BITS, ALL_STATIONS_MASK, station_mask, stations_in_mask
+from typing import Dict, Mapping, Sequence, Optional, Set, Tuple
 
 import math
+import time
 import random
+import functools
 
 
 PREDECESSORS: Mapping[Claimant, Mapping[StationCode, Optional[Sequence[StationCode]]]] = {
@@ -54,22 +58,62 @@ PREDECESSORS: Mapping[Claimant, Mapping[StationCode, Optional[Sequence[StationCo
 }
 
 
+# PREDECESSORS compiled to bitmasks, indexed by zone. A mask of 0 means the
+# station has no predecessors and is always capturable.
+PREDECESSOR_MASKS: Mapping[int, Mapping[StationCode, int]] = {
+    claimant.value: {
+        station: 0 if predecessors is None else station_mask(predecessors)
+        for station, predecessors in claimant_predecessors.items()
+    }
+    for claimant, claimant_predecessors in PREDECESSORS.items()
+}
+
+# Stations which list each station as a predecessor, indexed by zone
+SUCCESSOR_MASKS: Mapping[int, Mapping[StationCode, int]] = {
+    zone: {
+        station: sum(
+            STATION_BITS[successor]
+            for successor, predecessor_mask in predecessor_masks.items()
+            if predecessor_mask & STATION_BITS[station]
+        )
+        for station in StationCode
+    }
+    for zone, predecessor_masks in PREDECESSOR_MASKS.items()
+}
+
+_CAPTURE_RULES = {
+    zone: tuple(
+        (STATION_BITS[station], predecessor_mask)
+        for station, predecessor_mask in predecessor_masks.items()
+    )
+    for zone, predecessor_masks in PREDECESSOR_MASKS.items()
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def capturable_mask(zone: int, captured_mask: int) -> int:
+    mask = 0
+    for bit, predecessor_mask in _CAPTURE_RULES[zone]:
+        if not predecessor_mask or predecessor_mask & captured_mask:
+            mask |= bit
+    return mask
+
+
 def is_capturable(zone: int, station: StationCode, captured: Set[StationCode]) -> bool:
-    predecessors = PREDECESSORS[Claimant(zone)][station]
-    if predecessors is None:
-        return True
-    else:
-        return any(x in captured for x in predecessors)
+    predecessor_mask = PREDECESSOR_MASKS[zone][station]
+    return not predecessor_mask or bool(predecessor_mask & station_mask(captured))
 
 
 def effective_distance(from_location: Location, to_location: Location, dropped: bool) -> float:
-    from_zone = get_zone(from_location)
-    next_hop, is_direct = get_next_hop(from_zone, to_location, dropped)
-    if is_direct:
+    route_leg = get_route_leg(get_zone(from_location), get_zone(to_location), dropped)
+    if route_leg is None:
         return math.hypot(to_location.x - from_location.x, to_location.y - from_location.y)
-    intermediate = ZONE_CENTRES[next_hop]
-    intermediate_distance = math.hypot(intermediate.x - from_location.x, intermediate.y - from_location.y)
-    return intermediate_distance + effective_distance(intermediate, to_location, dropped)
+    first_hop, via_distance, last_hop = route_leg
+    return (
+        math.hypot(first_hop.x - from_location.x, first_hop.y - from_location.y) +
+        via_distance +
+        math.hypot(to_location.x - last_hop.x, to_location.y - last_hop.y)
+    )
 
 
 if NERF_MODE:
@@ -97,6 +141,9 @@ else:
     ]
     BANNED_TARGETS = []
 
+# Distances to high value targets are scaled by this when choosing between them
+HIGH_VALUE_DISCOUNT = 0.5
+
 
 def choose_next_target(
     zone: int,
@@ -106,16 +153,13 @@ def choose_next_target(
     dropped: bool,
     pseudo_distances: Mapping[StationCode, float],
 ) -> StationCode:
-    candidates = set()
-    for station in StationCode:
-        if station in captured:
-            continue
-        if station in disregard:
-            continue
-        if station in BANNED_TARGETS:
-            continue
-        if is_capturable(zone, station, captured):
-            candidates.add(station)
+    captured_mask = station_mask(captured)
+    candidates = list(stations_in_mask(
+        capturable_mask(zone, captured_mask) &
+        ~captured_mask &
+        ~station_mask(disregard) &
+        ~station_mask(BANNED_TARGETS)
+    ))
     if len(candidates) == 1:
         return next(iter(candidates))
     if len(candidates) == 0:
@@ -123,7 +167,175 @@ def choose_next_target(
     return min(
         candidates,
         key=lambda x: (
-            effective_distance(from_location, STATION_CODE_LOCATIONS[x], dropped) * (0.5 if x in HIGH_VALUE_TARGETS else 1) +
+            effective_distance(from_location, STATION_CODE_LOCATIONS[x], dropped) * (HIGH_VALUE_DISCOUNT if x in HIGH_VALUE_TARGETS else 1) +
             pseudo_distances[x]
         ),
     )
+
+
+# Lookahead planning over capture sequences. Travel is costed at a typical
+# driving speed, plus a fixed allowance for each claim.
+LOOKAHEAD_ENABLED = True
+LOOKAHEAD_DEPTH = 4
+# A capture's value halves for every this many seconds until it's made, so a
+# quicker sequence beats a slower one worth only a little more
+LOOKAHEAD_HALF_LIFE = 60.0
+LOOKAHEAD_BUDGET_SECONDS: Optional[float] = 0.02
+# A limit on the number of sequences searched, which unlike the budget gives
+# the same plans however fast the machine running it is. Either can be None.
+LOOKAHEAD_NODE_LIMIT: Optional[int] = None
+PLANNING_SPEED = 0.6 * MOTOR_LINEAR_SPEED
+CLAIM_TIME = 2.0
+# Value of capturing a high value target, relative to any other. Separate from
+# HIGH_VALUE_DISCOUNT, which only shapes the greedy choice.
+HIGH_VALUE_WEIGHT = 2.0
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def _station_travel_times(dropped: bool) -> Mapping[Tuple[StationCode, StationCode], float]:
+    return {
+        (origin, destination): effective_distance(
+            STATION_CODE_LOCATIONS[origin],
+            STATION_CODE_LOCATIONS[destination],
+            dropped,
+        ) / PLANNING_SPEED
+        for origin in StationCode
+        for destination in StationCode
+    }
+
+
+def plan_capture_sequence(
+    zone: int,
+    captured: Set[StationCode],
+    disregard: Set[StationCode],
+    from_location: Location,
+    dropped: bool,
+    pseudo_distances: Mapping[StationCode, float],
+    time_remaining: float,
+    max_depth: int = LOOKAHEAD_DEPTH,
+    budget: Optional[float] = LOOKAHEAD_BUDGET_SECONDS,
+    node_limit: Optional[int] = None,
+) -> Optional[Sequence[StationCode]]:
+    # Branch and bound for the sequence of up to max_depth captures with the
+    # most value, discounted by when each is made, which fits in the time
+    # remaining, breaking ties on time taken. Returns None if the search
+    # doesn't finish within the budget or the node limit.
+    deadline = math.inf if budget is None else time.perf_counter() + budget
+    nodes_left = math.inf if node_limit is None else node_limit
+    travel_times = _station_travel_times(dropped)
+    values = {
+        station: HIGH_VALUE_WEIGHT if station in HIGH_VALUE_TARGETS else 1
+        for station in StationCode
+    }
+    eligible_mask = ALL_STATIONS_MASK & ~(
+        station_mask(captured) |
+        station_mask(disregard) |
+        station_mask(BANNED_TARGETS)
+    )
+    eligible = list(stations_in_mask(eligible_mask))
+    penalties = {
+        station: pseudo_distances[station] / PLANNING_SPEED
+        for station in eligible
+    }
+
+    best_value = 0.0
+    best_elapsed = math.inf
+    best_sequence: Sequence[StationCode] = ()
+    # Time and value we've reached each (position, captured mask) with;
+    # arriving no sooner with no more value can't do any better
+    reached: Dict[Tuple[Optional[StationCode], int], Tuple[float, float]] = {}
+
+    def search(
+        position: Optional[StationCode],
+        held: int,
+        elapsed: float,
+        value: float,
+        sequence: Tuple[StationCode, ...],
+    ) -> None:
+        nonlocal best_value, best_elapsed, best_sequence, nodes_left
+        nodes_left -= 1
+        if nodes_left < 0 or time.perf_counter() > deadline:
+            raise _BudgetExceeded()
+
+        if value > best_value or (value == best_value and value > 0 and elapsed < best_elapsed):
+            best_value, best_elapsed, best_sequence = value, elapsed, sequence
+        if len(sequence) == max_depth:
+            return
+
+        remaining = [station for station in eligible if not held & STATION_BITS[station]]
+        capturable = capturable_mask(zone, held)
+        # Every capture from here is made after now, so discounted at least this much
+        optimistic = value + 0.5 ** (elapsed / LOOKAHEAD_HALF_LIFE) * sum(sorted(
+            (values[station] for station in remaining),
+            reverse=True,
+        )[:max_depth - len(sequence)])
+        if optimistic < best_value or (optimistic == best_value and elapsed >= best_elapsed):
+            return
+
+        children = []
+        for station in remaining:
+            if not capturable & STATION_BITS[station]:
+                continue
+            if position is None:
+                travel = effective_distance(from_location, STATION_CODE_LOCATIONS[station], dropped) / PLANNING_SPEED
+            else:
+                travel = travel_times[position, station]
+            arrival = elapsed + travel + penalties[station] + CLAIM_TIME
+            if arrival > time_remaining:
+                continue
+            children.append((arrival, station))
+        children.sort(key=lambda x: x[0])
+
+        for arrival, station in children:
+            new_held = held | STATION_BITS[station]
+            new_value = value + values[station] * 0.5 ** (arrival / LOOKAHEAD_HALF_LIFE)
+            key = (station, new_held)
+            previous = reached.get(key)
+            if previous is not None and previous[0] <= arrival and previous[1] >= new_value:
+                continue
+            reached[key] = (arrival, new_value)
+            search(station, new_held, arrival, new_value, sequence + (station,))
+
+    try:
+        search(None, station_mask(captured), 0.0, 0.0, ())
+    except _BudgetExceeded:
+        return None
+    return best_sequence
+
+
+def choose_next_target_lookahead(
+    zone: int,
+    captured: Set[StationCode],
+    disregard: Set[StationCode],
+    from_location: Location,
+    dropped: bool,
+    pseudo_distances: Mapping[StationCode, float],
+    time_remaining: float,
+) -> StationCode:
+    if LOOKAHEAD_ENABLED:
+        sequence = plan_capture_sequence(
+            zone,
+            captured,
+            disregard,
+            from_location,
+            dropped,
+            pseudo_distances,
+            time_remaining,
+            budget=LOOKAHEAD_BUDGET_SECONDS,
+            node_limit=LOOKAHEAD_NODE_LIMIT,
+        )
+        if sequence:
+            return sequence[0]
+    # Out of budget, or nothing fits in the time left
+    return choose_next_target(
+        zone,
+        captured,
+        disregard,
+        from_location,
+        dropped,
+        pseudo_distances,
+    )
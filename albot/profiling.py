@@ -0,0 +1,146 @@
+import math
+import time
+import signal
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+# Latency buckets grow geometrically from one microsecond, so every bucket has
+# the same relative resolution (about 9%) and a few hundred cover up to minutes
+SMALLEST_BUCKET = 1e-6
+BUCKETS_PER_DOUBLING = 8
+BUCKET_COUNT = 27 * BUCKETS_PER_DOUBLING
+
+_LOG_RATIO = math.log(2) / BUCKETS_PER_DOUBLING
+
+REPORT_PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def add(self, duration: float) -> None:
+        if duration > SMALLEST_BUCKET:
+            index = min(BUCKET_COUNT - 1, math.ceil(math.log(duration / SMALLEST_BUCKET) / _LOG_RATIO))
+        else:
+            index = 0
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += duration
+        if duration < self.minimum:
+            self.minimum = duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        # Upper edge of the bucket holding the given rank, which overestimates
+        # by at most one bucket's width
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(self.maximum, SMALLEST_BUCKET * math.exp(index * _LOG_RATIO))
+        return self.maximum
+
+    def __str__(self) -> str:
+        percentiles = ', '.join(
+            f"p{x} {self.percentile(x) * 1000:.2f}ms"
+            for x in REPORT_PERCENTILES
+        )
+        return f"{self.count} samples, mean {self.mean * 1000:.2f}ms, {percentiles}, max {self.maximum * 1000:.2f}ms"
+
+
+# Times the stages of the control loop. Callers chain laps, each of which
+# records the time since the previous one:
+#
+#     start = profiler.now()
+#     ...
+#     start = profiler.lap('sense', start)
+class Profiler:
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.actions: Dict[Hashable, LatencyHistogram] = {}
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def lap(self, stage: str, start: float) -> float:
+        end = time.perf_counter()
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.add(end - start)
+        return end
+
+    def lap_action(self, action: object, start: float) -> float:
+        # Also broken down by the type of action, since some, such as claims,
+        # wait on the radio
+        end = self.lap('perform', start)
+        action_type = type(action)
+        histogram = self.actions.get(action_type)
+        if histogram is None:
+            histogram = self.actions[action_type] = LatencyHistogram()
+        histogram.add(end - start)
+        return end
+
+    def summary(self) -> Sequence[str]:
+        total = sum(x.total for x in self.stages.values())
+        lines: List[str] = []
+        for name, histogram in self.stages.items():
+            share = histogram.total / total if total else 0.0
+            lines.append(f"{name:>12}: {share:4.0%} of loop time, {histogram}")
+        actions: List[Tuple[str, LatencyHistogram]] = sorted(
+            ((getattr(x, '__name__', str(x)), y) for x, y in self.actions.items()),
+            key=lambda x: x[1].total,
+            reverse=True,
+        )
+        for name, histogram in actions:
+            lines.append(f"{name:>24}: {histogram}")
+        return lines
+
+
+# Stands in for a Profiler when profiling is switched off
+class NullProfiler(Profiler):
+    enabled = False
+
+    def now(self) -> float:
+        return 0.0
+
+    def lap(self, stage: str, start: float) -> float:
+        return 0.0
+
+    def lap_action(self, action: object, start: float) -> float:
+        return 0.0
+
+    def summary(self) -> Sequence[str]:
+        return []
+
+
+def print_summary(profiler: Profiler) -> None:
+    for line in profiler.summary():
+        print("Profile: ", line)
+
+
+def install_report_signal(profiler: Profiler) -> Optional[Callable[[], None]]:
+    # Dump the summary on SIGUSR1, where the platform has it and we're on the
+    # main thread. Returns a function which restores the previous handler.
+    if not profiler.enabled or not hasattr(signal, 'SIGUSR1'):
+        return None
+    if threading.current_thread() is not threading.main_thread():
+        return None
+    previous = signal.signal(signal.SIGUSR1, lambda signum, frame: print_summary(profiler))
+    return lambda: signal.signal(signal.SIGUSR1, previous)
@@ -0,0 +1,44 @@
+from sr.robot import Robot
+
+
+class RateScheduler:
+    def __init__(self, robot: Robot, rate: float) -> None:
+        self.robot = robot
+        self.period = 1 / rate
+        self.deadline = robot.time() + self.period
+        self.ticks = 0
+        self.overruns = 0
+        self.worst_lateness = 0.0
+        self.total_lateness = 0.0
+
+    def wait(self) -> None:
+        remaining = self.end_tick()
+        if remaining > 0:
+            self.robot.sleep(remaining)
+
+    def end_tick(self) -> float:
+        # Returns whatever remains of this period, for the caller to sleep
+        # for; if the tick ran past its deadline, record the overrun and start
+        # the next period from now rather than trying to catch up on missed
+        # ticks.
+        self.ticks += 1
+        now = self.robot.time()
+        remaining = self.deadline - now
+        if remaining > 0:
+            self.deadline += self.period
+        else:
+            lateness = -remaining
+            self.overruns += 1
+            self.total_lateness += lateness
+            self.worst_lateness = max(self.worst_lateness, lateness)
+            self.deadline = now + self.period
+        return remaining
+
+    def __str__(self) -> str:
+        mean_lateness = self.total_lateness / self.overruns if self.overruns else 0.0
+        return (
+            f"{self.ticks} ticks at {1 / self.period:.0f}Hz, "
+            f"{self.overruns} overruns, "
+            f"mean lateness {1000 * mean_lateness:.1f}ms, "
+            f"worst lateness {1000 * self.worst_lateness:.1f}ms"
+        )
@@ -0,0 +1,465 @@
+import os
+import math
+import time
+import random
+import threading
+import contextlib
+import dataclasses
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sr.robot import StationCode, Claimant
+
+from albot.kalman import MOTOR_LINEAR_SPEED, MOTOR_LINEAR_SPEED_STDEV, LEVER_ARM
+from albot.view import STATION_CODE_LOCATIONS, MATCH_DURATION
+from albot.navmesh import ARENA_HALF_LENGTH, ARENA_HALF_WIDTH, ROBOT_RADIUS, TOWER_RADIUS
+from albot import planning
+from albot.planning import PREDECESSORS
+
+if TYPE_CHECKING:
+    from albot.profiling import Profiler
+
+
+PHYSICS_STEP = 0.005
+
+SWEEP_DURATION = 0.08
+CLAIM_DURATION = 1.0
+CLAIM_RANGE = 0.6
+RADIO_RANGE = 5.0
+RADIO_BEARING_STDEV = math.radians(3)
+RADIO_SIGNAL_STDEV = 0.05
+
+COMPASS_STDEV = math.radians(2)
+
+ULTRASOUND_ANGLE = math.radians(20)
+ULTRASOUND_OFFSET = 0.15
+ULTRASOUND_RANGE = 3.0
+
+_TOWER_CIRCLES = tuple((location.x, location.y, TOWER_RADIUS) for location in STATION_CODE_LOCATIONS.values())
+
+# Default speed up over real time for matches run by the async runtime
+ASYNC_REAL_TIME_FACTOR = 10.0
+
+# Matches limit the lookahead by the number of sequences it searches rather
+# than by its wall-clock budget, so that they play out the same however busy
+# the machine is, as the tuner relies on. Searches rarely take more than a
+# hundred or so; this is roughly what the budget allows on a desktop.
+SIMULATED_LOOKAHEAD_NODE_LIMIT = 1000
+
+POINTS_PER_CLAIM = 1
+POINTS_PER_HELD_TERRITORY = 2
+
+
+class MatchOver(Exception):
+    pass
+
+
+class SimTargetInfo(NamedTuple):
+    station_code: StationCode
+    owned_by: Optional[int]
+
+
+class SimTarget(NamedTuple):
+    bearing: float
+    signal_strength: float
+    target_info: SimTargetInfo
+
+
+class SimMotorChannel:
+    def __init__(self) -> None:
+        self._power = 0.0
+
+    @property
+    def power(self) -> float:
+        return self._power
+
+    @power.setter
+    def power(self, value: float) -> None:
+        self._power = max(-100.0, min(100.0, float(value)))
+
+
+class SimMotorBoard:
+    def __init__(self) -> None:
+        self.m0 = SimMotorChannel()
+        self.m1 = SimMotorChannel()
+
+
+class SimCompass:
+    def __init__(self, robot: 'SimulatedRobot') -> None:
+        self._robot = robot
+
+    def get_heading(self) -> float:
+        robot = self._robot
+        return (robot.heading + robot.rng.gauss(0, COMPASS_STDEV)) % math.tau
+
+
+class SimRadio:
+    def __init__(self, robot: 'SimulatedRobot') -> None:
+        self._robot = robot
+
+    def sweep(self) -> List[SimTarget]:
+        robot = self._robot
+        robot.advance(SWEEP_DURATION)
+        targets = []
+        with robot.lock:
+            for station, location in STATION_CODE_LOCATIONS.items():
+                dx = location.x - robot.x
+                dy = location.y - robot.y
+                distance = max(math.hypot(dx, dy), 0.05)
+                if distance > RADIO_RANGE:
+                    continue
+                bearing = math.atan2(dx, dy) - robot.heading + robot.rng.gauss(0, RADIO_BEARING_STDEV)
+                bearing = (bearing + math.pi) % math.tau - math.pi
+                signal_strength = distance ** -2 * max(0.1, 1 + robot.rng.gauss(0, RADIO_SIGNAL_STDEV))
+                targets.append(SimTarget(
+                    bearing=bearing,
+                    signal_strength=signal_strength,
+                    target_info=SimTargetInfo(
+                        station_code=station,
+                        owned_by=robot.owners[station],
+                    ),
+                ))
+        return targets
+
+    def claim_territory(self) -> None:
+        robot = self._robot
+        robot.advance(CLAIM_DURATION)
+        with robot.lock:
+            station, distance = robot.nearest_station()
+            if distance > CLAIM_RANGE:
+                return
+            robot.claim(station, robot.zone)
+
+
+# Scripted robot for the other zone. It drives straight for the nearest station
+# it can claim, passing through any towers on the way since they're thin,
+# claims it and moves on. Our robot and its ultrasound see it as a circle, but
+# it takes no notice of us.
+OPPONENT_SPEED = 0.5
+OPPONENT_CLAIM_DISTANCE = 0.4
+# Randomly stretches distances when the opponent picks a station, so it
+# doesn't follow the same route every match
+OPPONENT_CHOICE_JITTER = 0.5
+
+
+class SimOpponent:
+    def __init__(self, zone: int, seed: Optional[int]) -> None:
+        self.zone = zone
+        self.rng = random.Random(None if seed is None else f"opponent-{seed}")
+        self.x = -7.0 if zone == 0 else 7.0
+        self.y = 0.0
+        self.target: Optional[StationCode] = None
+        self.claim_started: Optional[float] = None
+
+    def _choose_target(self, robot: 'SimulatedRobot') -> Optional[StationCode]:
+        candidates = [
+            (
+                math.hypot(location.x - self.x, location.y - self.y) *
+                (1 + OPPONENT_CHOICE_JITTER * self.rng.random()),
+                station,
+            )
+            for station, location in STATION_CODE_LOCATIONS.items()
+            if robot.owners[station] != self.zone and robot.is_capturable(station, self.zone)
+        ]
+        if not candidates:
+            return None
+        return min(candidates)[1]
+
+    def step(self, robot: 'SimulatedRobot', dt: float) -> None:
+        if self.target is None or robot.owners[self.target] == self.zone:
+            self.target = self._choose_target(robot)
+            self.claim_started = None
+            if self.target is None:
+                return
+        location = STATION_CODE_LOCATIONS[self.target]
+        dx = location.x - self.x
+        dy = location.y - self.y
+        distance = math.hypot(dx, dy)
+        if distance > OPPONENT_CLAIM_DISTANCE:
+            travel = min(OPPONENT_SPEED * dt, distance)
+            self.x += dx * travel / distance
+            self.y += dy * travel / distance
+        elif self.claim_started is None:
+            self.claim_started = robot.time()
+        elif robot.time() - self.claim_started >= CLAIM_DURATION:
+            robot.claim(self.target, self.zone)
+            self.target = None
+
+
+class SimRuggeduino:
+    def __init__(self, robot: 'SimulatedRobot') -> None:
+        self._robot = robot
+
+    def analogue_read(self, pin: int) -> float:
+        # Pins 0 and 1 are the front left and front right ultrasound sensors
+        robot = self._robot
+        offset = -ULTRASOUND_ANGLE if pin == 0 else ULTRASOUND_ANGLE
+        with robot.lock:
+            return robot.ray_distance(robot.heading + offset)
+
+    def digital_read(self, pin: int) -> bool:
+        # Pin 2 is the front bump switch
+        return self._robot.bumped
+
+
+# In-process stand-in for the parts of sr.robot.Robot that albot uses. Time is
+# virtual and only advances through sleep, radio sweeps and claims, so a whole
+# match runs as fast as the control code allows. Given a real time factor it
+# instead follows the wall clock, sped up by that factor, which is what
+# control code running several threads at once needs.
+class SimulatedRobot:
+    def __init__(
+        self,
+        zone: int = 0,
+        seed: Optional[int] = None,
+        duration: float = MATCH_DURATION,
+        opponent: bool = False,
+        real_time_factor: Optional[float] = None,
+    ) -> None:
+        self.zone = zone
+        self.duration = duration
+        self.rng = random.Random(seed)
+        self.lock = threading.RLock()
+
+        self.motors = [SimMotorBoard()]
+        self.compass = SimCompass(self)
+        self.radio = SimRadio(self)
+        self.ruggeduinos = [SimRuggeduino(self)]
+
+        self.x = -7.0 if zone == 0 else 7.0
+        self.y = 0.0
+        self.heading = math.radians(90) if zone == 0 else math.radians(270)
+        self.bumped = False
+
+        self.opponent = SimOpponent(zone=1 - zone, seed=seed) if opponent else None
+
+        self.owners: Dict[StationCode, Optional[int]] = {x: None for x in StationCode}
+        self.captures: List[Tuple[float, StationCode]] = []
+
+        self._time = 0.0
+        self.real_time_factor = real_time_factor
+        self._wall_start = time.perf_counter()
+        # Per-match wheel speed calibration error, as seen between real robots
+        self._speed_scale = 1 + self.rng.gauss(0, MOTOR_LINEAR_SPEED_STDEV / MOTOR_LINEAR_SPEED)
+
+    def time(self) -> float:
+        if self.real_time_factor is not None:
+            self._catch_up()
+        return self._time
+
+    def sleep(self, duration: float) -> None:
+        self.advance(duration)
+
+    def advance(self, duration: float) -> None:
+        if self.real_time_factor is not None:
+            # Block the calling thread for the time taken, leaving the others
+            # to carry on
+            time.sleep(max(0.0, duration) / self.real_time_factor)
+            self._catch_up()
+            return
+        with self.lock:
+            self._run_until(self._time + max(0.0, duration))
+
+    def _catch_up(self) -> None:
+        with self.lock:
+            self._run_until((time.perf_counter() - self._wall_start) * self.real_time_factor)
+
+    def _run_until(self, end: float) -> None:
+        end = min(end, self.duration)
+        while self._time < end:
+            dt = min(PHYSICS_STEP, end - self._time)
+            self._step(dt)
+            self._time += dt
+        if self._time >= self.duration:
+            raise MatchOver()
+
+    def _step(self, dt: float) -> None:
+        left_velocity = MOTOR_LINEAR_SPEED * self._speed_scale * self.motors[0].m0.power / 100
+        right_velocity = MOTOR_LINEAR_SPEED * self._speed_scale * self.motors[0].m1.power / 100
+        surge = (left_velocity + right_velocity) * 0.5
+        rotation = (left_velocity - right_velocity) / LEVER_ARM
+        self.x += surge * math.sin(self.heading) * dt
+        self.y += surge * math.cos(self.heading) * dt
+        self.heading = (self.heading + rotation * dt) % math.tau
+        if self.opponent is not None:
+            self.opponent.step(self, dt)
+        self.bumped = self._resolve_collisions()
+
+    def _resolve_collisions(self) -> bool:
+        collided = False
+
+        limit_x = ARENA_HALF_LENGTH - ROBOT_RADIUS
+        limit_y = ARENA_HALF_WIDTH - ROBOT_RADIUS
+        if abs(self.x) > limit_x:
+            self.x = math.copysign(limit_x, self.x)
+            collided = True
+        if abs(self.y) > limit_y:
+            self.y = math.copysign(limit_y, self.y)
+            collided = True
+
+        clearance = ROBOT_RADIUS + TOWER_RADIUS
+        for location in STATION_CODE_LOCATIONS.values():
+            dx = self.x - location.x
+            dy = self.y - location.y
+            distance = math.hypot(dx, dy)
+            if distance >= clearance:
+                continue
+            if distance == 0:
+                dx, dy, distance = 1.0, 0.0, 1.0
+            self.x = location.x + dx * clearance / distance
+            self.y = location.y + dy * clearance / distance
+            collided = True
+
+        if self.opponent is not None:
+            clearance = 2 * ROBOT_RADIUS
+            dx = self.x - self.opponent.x
+            dy = self.y - self.opponent.y
+            distance = math.hypot(dx, dy)
+            if distance < clearance:
+                if distance == 0:
+                    dx, dy, distance = 1.0, 0.0, 1.0
+                self.x = self.opponent.x + dx * clearance / distance
+                self.y = self.opponent.y + dy * clearance / distance
+                collided = True
+
+        return collided
+
+    def nearest_station(self) -> Tuple[StationCode, float]:
+        return min(
+            (
+                (station, math.hypot(location.x - self.x, location.y - self.y))
+                for station, location in STATION_CODE_LOCATIONS.items()
+            ),
+            key=lambda x: x[1],
+        )
+
+    def is_capturable(self, station: StationCode, zone: int) -> bool:
+        predecessors = PREDECESSORS[Claimant(zone)][station]
+        if predecessors is None:
+            return True
+        return any(self.owners[x] == zone for x in predecessors)
+
+    def claim(self, station: StationCode, zone: int) -> bool:
+        if self.owners[station] == zone or not self.is_capturable(station, zone):
+            return False
+        self.owners[station] = zone
+        if zone == self.zone:
+            self.captures.append((self._time, station))
+        return True
+
+    def ray_distance(self, bearing: float) -> float:
+        origin_x = self.x + ULTRASOUND_OFFSET * math.sin(self.heading)
+        origin_y = self.y + ULTRASOUND_OFFSET * math.cos(self.heading)
+        dx = math.sin(bearing)
+        dy = math.cos(bearing)
+
+        distance = ULTRASOUND_RANGE
+        if dx > 0:
+            distance = min(distance, (ARENA_HALF_LENGTH - origin_x) / dx)
+        elif dx < 0:
+            distance = min(distance, (-ARENA_HALF_LENGTH - origin_x) / dx)
+        if dy > 0:
+            distance = min(distance, (ARENA_HALF_WIDTH - origin_y) / dy)
+        elif dy < 0:
+            distance = min(distance, (-ARENA_HALF_WIDTH - origin_y) / dy)
+
+        circles = _TOWER_CIRCLES
+        if self.opponent is not None:
+            circles = circles + ((self.opponent.x, self.opponent.y, ROBOT_RADIUS),)
+        for x, y, radius in circles:
+            # Ray-circle intersection against each tower, and the other robot
+            ox = x - origin_x
+            oy = y - origin_y
+            along = ox * dx + oy * dy
+            if along <= 0:
+                continue
+            perpendicular_squared = ox * ox + oy * oy - along * along
+            if perpendicular_squared > radius ** 2:
+                continue
+            distance = min(distance, along - math.sqrt(radius ** 2 - perpendicular_squared))
+
+        return max(0.0, distance)
+
+    def held_territories(self) -> Sequence[StationCode]:
+        return [x for x, owner in self.owners.items() if owner == self.zone]
+
+
+@dataclasses.dataclass(frozen=True)
+class MatchResult:
+    seed: Optional[int]
+    zone: int
+    captures: Sequence[Tuple[float, StationCode]]
+    held: Sequence[StationCode]
+    score: int
+    wall_time: float
+
+    @property
+    def time_per_capture(self) -> float:
+        # Mean match time spent on each capture, counted from the start
+        if not self.captures:
+            return math.inf
+        return self.captures[-1][0] / len(self.captures)
+
+
+@contextlib.contextmanager
+def _deterministic_lookahead() -> Iterator[None]:
+    budget, node_limit = planning.LOOKAHEAD_BUDGET_SECONDS, planning.LOOKAHEAD_NODE_LIMIT
+    planning.LOOKAHEAD_BUDGET_SECONDS = None
+    planning.LOOKAHEAD_NODE_LIMIT = SIMULATED_LOOKAHEAD_NODE_LIMIT
+    try:
+        yield
+    finally:
+        planning.LOOKAHEAD_BUDGET_SECONDS, planning.LOOKAHEAD_NODE_LIMIT = budget, node_limit
+
+
+def run_match(
+    seed: Optional[int] = None,
+    zone: int = 0,
+    duration: float = MATCH_DURATION,
+    quiet: bool = True,
+    localisation: str = 'kalman',
+    trace_path: Optional[str] = None,
+    profiler: Optional['Profiler'] = None,
+    opponent: bool = False,
+    runtime: str = 'sync',
+    real_time_factor: Optional[float] = None,
+) -> MatchResult:
+    from albot.main import run
+
+    # The strategy code draws from the global generator, seed it for repeatability
+    random.seed(seed)
+    if runtime == 'async' and real_time_factor is None:
+        # Its stages run on several threads at once, which virtual time can't follow
+        real_time_factor = ASYNC_REAL_TIME_FACTOR
+    robot = SimulatedRobot(
+        zone=zone,
+        seed=seed,
+        duration=duration,
+        opponent=opponent,
+        real_time_factor=real_time_factor,
+    )
+
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_deterministic_lookahead())
+        if quiet:
+            devnull = stack.enter_context(open(os.devnull, 'w'))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        try:
+            if runtime == 'async':
+                from albot.async_runtime import run_async
+                run_async(robot, localisation=localisation, time_scale=real_time_factor)
+            else:
+                run(robot, localisation=localisation, trace_path=trace_path, profiler=profiler)
+        except MatchOver:
+            pass
+    wall_time = time.perf_counter() - start
+
+    held = robot.held_territories()
+    return MatchResult(
+        seed=seed,
+        zone=zone,
+        captures=list(robot.captures),
+        held=held,
+        score=POINTS_PER_CLAIM * len(robot.captures) + POINTS_PER_HELD_TERRITORY * len(held),
+        wall_time=wall_time,
+    )
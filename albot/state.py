@@ -1,43 +1,250 @@
 import math
 import dataclasses
-from typing import Set, Optional, Sequence, Mapping
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Mapping
 
 from sr.robot import Robot, StationCode
-from albot.pid import PIDController
+from albot.pid import DiscretePIDController
 from albot.view import Location
 from albot.navmesh import Zone
 from albot.kalman import KalmanFilter
+from albot.opponent import OpponentTracker
+from albot.stations import StationSet, EMPTY_STATIONS
 
+if TYPE_CHECKING:
+    from albot.actions import Action
+    from albot.sweeper import RadioSweeper
 
+
+ZONE_HISTORY_LENGTH = 4
+
+
+# The last few zones we've been in, as a ring with a count per zone kept up to
+# date as zones are pushed, so tracking the current zone doesn't allocate. The
+# current zone is the most common one with the latest counted twice, ties
+# going to whichever arrived first as with Counter.most_common.
+class ZoneHistory:
+    __slots__ = ('zones', 'start', 'length', 'counts', 'current')
+
+    def __init__(self, length: int = ZONE_HISTORY_LENGTH) -> None:
+        self.zones: List[Optional[Zone]] = [None] * length
+        self.start = 0
+        self.length = 0
+        self.counts: Dict[Zone, int] = {zone: 0 for zone in Zone}
+        self.current: Optional[Zone] = None
+
+    def push(self, zone: Zone) -> Optional[Zone]:
+        zones = self.zones
+        capacity = len(zones)
+        if self.length == capacity:
+            self.counts[zones[self.start]] -= 1
+            zones[self.start] = zone
+            self.start = (self.start + 1) % capacity
+        else:
+            zones[(self.start + self.length) % capacity] = zone
+            self.length += 1
+        self.counts[zone] += 1
+
+        best = None
+        best_count = 0
+        for index in range(self.length):
+            candidate = zones[(self.start + index) % capacity]
+            count = self.counts[candidate] + (candidate is zone)
+            if count > best_count:
+                best, best_count = candidate, count
+        self.current = best if best_count > 1 else None
+        return self.current
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Zone]:
+        # Oldest first
+        for index in range(self.length):
+            yield self.zones[(self.start + index) % len(self.zones)]
+
+
+# What choose_action settled on, kept while the inputs that decide it are
+# unchanged: the zone we're in, the stations we hold and those we can't
+# capture, and whether the drop has happened. Routes to the target are kept
+# per grid cell, as the planned path only depends on the cell it starts from.
+# Claims, ownership changes and changes of zone also invalidate it explicitly.
+class DecisionCache:
+    __slots__ = (
+        'valid',
+        'zone',
+        'captured',
+        'uncapturable',
+        'dropped',
+        'target',
+        'routes',
+        'hits',
+        'misses',
+        'route_hits',
+        'route_misses',
+        'invalidations',
+    )
+
+    def __init__(self) -> None:
+        self.valid = False
+        self.zone: Optional[Zone] = None
+        self.captured = 0
+        self.uncapturable = 0
+        self.dropped = False
+        self.target: Optional[StationCode] = None
+        self.routes: Dict[int, 'Action'] = {}
+        self.hits = 0
+        self.misses = 0
+        self.route_hits = 0
+        self.route_misses = 0
+        self.invalidations = 0
+
+    def lookup(
+        self,
+        zone: Optional[Zone],
+        captured: int,
+        uncapturable: int,
+        dropped: bool,
+    ) -> Optional[StationCode]:
+        if (
+            self.valid and
+            zone is self.zone and
+            captured == self.captured and
+            uncapturable == self.uncapturable and
+            dropped == self.dropped
+        ):
+            self.hits += 1
+            return self.target
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        zone: Optional[Zone],
+        captured: int,
+        uncapturable: int,
+        dropped: bool,
+        target: StationCode,
+    ) -> None:
+        # Routes only depend on the target and the drop, so survive anything else
+        if target != self.target or dropped != self.dropped:
+            self.routes.clear()
+        self.zone = zone
+        self.captured = captured
+        self.uncapturable = uncapturable
+        self.dropped = dropped
+        self.target = target
+        self.valid = True
+
+    def route(self, target: StationCode, dropped: bool, cell: int) -> Optional['Action']:
+        # Routes are only kept for the stored target, so one chosen without
+        # being stored, such as a fallback, is always planned afresh
+        action = None
+        if target is self.target and dropped == self.dropped:
+            action = self.routes.get(cell)
+        if action is None:
+            self.route_misses += 1
+        else:
+            self.route_hits += 1
+        return action
+
+    def store_route(self, target: StationCode, dropped: bool, cell: int, action: 'Action') -> None:
+        if target is self.target and dropped == self.dropped:
+            self.routes[cell] = action
+
+    def invalidate(self) -> None:
+        if self.valid:
+            self.invalidations += 1
+            self.valid = False
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        route_lookups = self.route_hits + self.route_misses
+        return (
+            f"target {self.hits}/{lookups} hits ({self.hits / lookups if lookups else 0:.0%}), "
+            f"route {self.route_hits}/{route_lookups} hits ({self.route_hits / route_lookups if route_lookups else 0:.0%}), "
+            f"{self.invalidations} invalidations"
+        )
+
+
+# Slotted, and without defaults so that the slots don't clash with class
+# attributes; every field is set in initial_state
 @dataclasses.dataclass
 class State:
+    __slots__ = (
+        'zone',
+        'heading_pid',
+        'captured',
+        'uncapturable',
+        'current_target',
+        'current_zone',
+        'zone_history',
+        'kalman',
+        'kalman_time',
+        'sweep_time',
+        'num_captures',
+        'radio',
+        'opponent',
+        'decisions',
+    )
+
     zone: int
-    heading_pid: PIDController
-    captured: Set[StationCode]
-    uncapturable: Set[StationCode]
+    heading_pid: DiscretePIDController
+    captured: StationSet
+    uncapturable: StationSet
     current_target: Optional[StationCode]
     current_zone: Optional[Zone]
-    zone_history: Sequence[Zone]
+    zone_history: ZoneHistory
     kalman: KalmanFilter
     kalman_time: float
+    sweep_time: float
     num_captures: Mapping[StationCode, int]
+    radio: Optional['RadioSweeper']
+    opponent: OpponentTracker
+    decisions: DecisionCache
+
+
+LOCALISATION_ENGINES = ('kalman', 'ekf', 'particle')
+
+
+def make_estimator(
+    localisation: str,
+    initial_position: Location,
+    initial_heading: float,
+    seed: Optional[int] = None,
+) -> KalmanFilter:
+    if localisation == 'kalman':
+        return KalmanFilter(initial_position=initial_position, initial_heading=initial_heading)
+    elif localisation == 'ekf':
+        # Imported here so that numpy is only needed when one of these is selected
+        from albot.ekf import PoseKalmanFilter
+        return PoseKalmanFilter(initial_position=initial_position, initial_heading=initial_heading)
+    elif localisation == 'particle':
+        from albot.particle_filter import ParticleFilter
+        return ParticleFilter(initial_position=initial_position, initial_heading=initial_heading, seed=seed)
+    raise ValueError(f"Unknown localisation engine {localisation!r}, expected one of {LOCALISATION_ENGINES}")
 
 
-def initial_state(robot: Robot) -> State:
+def initial_state(
+    robot: Robot,
+    localisation: str = 'kalman',
+    radio: Optional['RadioSweeper'] = None,
+    seed: Optional[int] = None,
+) -> State:
     return State(
         zone=robot.zone,
-        heading_pid=PIDController(
+        heading_pid=DiscretePIDController(
             full_deflection_error=math.radians(120),
             prediction_time=0.3,
-            fine_tune_time=2.0,
+            fine_tune_time=8.0,
             time=lambda: robot.time(),
         ),
-        captured=frozenset(),
-        uncapturable=frozenset(),
+        captured=EMPTY_STATIONS,
+        uncapturable=EMPTY_STATIONS,
         current_target=None,
         current_zone=None,
-        zone_history=[],
-        kalman=KalmanFilter(
+        zone_history=ZoneHistory(),
+        kalman=make_estimator(
+            localisation,
             initial_position=(
                 Location(x=-7, y=0)
                 if robot.zone == 0
@@ -48,10 +255,15 @@ def initial_state(robot: Robot) -> State:
                 if robot.zone == 0
                 else math.radians(270)
             ),
+            seed=seed,
         ),
         kalman_time=robot.time(),
+        sweep_time=-math.inf,
         num_captures={
             x: 0
             for x in StationCode
         },
+        radio=radio,
+        opponent=OpponentTracker(zone=robot.zone, start_time=robot.time()),
+        decisions=DecisionCache(),
     )
@@ -0,0 +1,76 @@
+import collections.abc
+from typing import Iterable, Iterator, Optional, Tuple
+
+from sr.robot import StationCode
+
+
+# Each station is one bit of an int, so sets of stations are cheap to copy,
+# compare, combine and hash
+STATION_BITS = {station: 1 << index for index, station in enumerate(StationCode)}
+ALL_STATIONS_MASK = (1 << len(STATION_BITS)) - 1
+
+_STATIONS_BY_BIT: Tuple[Tuple[StationCode, int], ...] = tuple(STATION_BITS.items())
+
+
+def station_mask(stations: Iterable[StationCode]) -> int:
+    if isinstance(stations, StationSet):
+        return stations.mask
+    mask = 0
+    for station in stations:
+        mask |= STATION_BITS[station]
+    return mask
+
+
+def stations_in_mask(mask: int) -> Iterator[StationCode]:
+    for station, bit in _STATIONS_BY_BIT:
+        if mask & bit:
+            yield station
+
+
+# Immutable set of stations backed by a bitmask, usable anywhere the code
+# expects a Set or frozenset of StationCode
+class StationSet(collections.abc.Set):
+    __slots__ = ('mask',)
+
+    def __init__(self, stations: Iterable[StationCode] = (), mask: Optional[int] = None) -> None:
+        self.mask = station_mask(stations) if mask is None else mask
+
+    @classmethod
+    def from_mask(cls, mask: int) -> 'StationSet':
+        return cls(mask=mask)
+
+    @classmethod
+    def _from_iterable(cls, iterable: Iterable[StationCode]) -> 'StationSet':
+        return cls(iterable)
+
+    def __contains__(self, station: object) -> bool:
+        return bool(self.mask & STATION_BITS.get(station, 0))  # type: ignore
+
+    def __iter__(self) -> Iterator[StationCode]:
+        return stations_in_mask(self.mask)
+
+    def __len__(self) -> int:
+        return bin(self.mask).count('1')
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, StationSet):
+            return self.mask == other.mask
+        return super().__eq__(other)
+
+    def __or__(self, other: Iterable[StationCode]) -> 'StationSet':  # type: ignore
+        return StationSet.from_mask(self.mask | station_mask(other))
+
+    def __and__(self, other: Iterable[StationCode]) -> 'StationSet':  # type: ignore
+        return StationSet.from_mask(self.mask & station_mask(other))
+
+    def __sub__(self, other: Iterable[StationCode]) -> 'StationSet':  # type: ignore
+        return StationSet.from_mask(self.mask & ~station_mask(other))
+
+    # Hashes like the equivalent frozenset, since the two compare equal
+    __hash__ = collections.abc.Set._hash
+
+    def __repr__(self) -> str:
+        return f"StationSet({{{', '.join(str(x) for x in self)}}})"
+
+
+EMPTY_STATIONS = StationSet()
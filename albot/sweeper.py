@@ -0,0 +1,104 @@
+import threading
+import dataclasses
+from typing import Optional, Sequence
+
+from sr.robot import Robot
+from sr.robot.radio import Target
+
+
+# How long, in real time, to wait for the background sweeper before falling
+# back to sweeping directly
+SWEEP_TIMEOUT = 1.0
+
+
+@dataclasses.dataclass(frozen=True)
+class SweepSnapshot:
+    targets: Sequence[Target]
+    started: float
+    finished: float
+    sequence: int
+
+    @property
+    def time(self) -> float:
+        return (self.started + self.finished) / 2
+
+
+class RadioSweeper:
+    def __init__(self, robot: Robot) -> None:
+        self.robot = robot
+        # Serialises use of the radio between sweeps and claims
+        self.radio_lock = threading.Lock()
+        self.published = threading.Condition()
+        # Replaced wholesale on each sweep, so readers never need a lock
+        self.snapshot: Optional[SweepSnapshot] = None
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.sequence = 0
+
+    def start(self) -> None:
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, name='radio-sweeper', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=SWEEP_TIMEOUT)
+            self.thread = None
+
+    def latest(self) -> Optional[SweepSnapshot]:
+        return self.snapshot
+
+    def age(self) -> float:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return float('inf')
+        return self.robot.time() - snapshot.time
+
+    def newer_than(self, time: float) -> Optional[SweepSnapshot]:
+        # The latest sweep if it started at or after the given robot time,
+        # without waiting for one
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.started >= time:
+            return snapshot
+        return None
+
+    def sweep_newer_than(self, time: float) -> SweepSnapshot:
+        # A sweep which started at or after the given robot time
+        with self.published:
+            self.published.wait_for(
+                lambda: self.snapshot is not None and self.snapshot.started >= time,
+                timeout=SWEEP_TIMEOUT,
+            )
+            snapshot = self.snapshot
+        if snapshot is not None and snapshot.started >= time:
+            return snapshot
+        return self.sweep()
+
+    def claim_territory(self) -> float:
+        # Returns the robot time at which the claim completed
+        with self.radio_lock:
+            self.robot.radio.claim_territory()
+            return self.robot.time()
+
+    def sweep(self) -> SweepSnapshot:
+        with self.radio_lock:
+            started = self.robot.time()
+            targets = list(self.robot.radio.sweep())
+            finished = self.robot.time()
+        with self.published:
+            self.sequence += 1
+            snapshot = SweepSnapshot(
+                targets=targets,
+                started=started,
+                finished=finished,
+                sequence=self.sequence,
+            )
+            if self.snapshot is None or snapshot.started > self.snapshot.started:
+                self.snapshot = snapshot
+            self.published.notify_all()
+        return snapshot
+
+    def _run(self) -> None:
+        while not self.stopping.is_set():
+            self.sweep()
@@ -0,0 +1,121 @@
+import struct
+import threading
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+
+# Every record has the same layout: kind, robot time and five float fields
+# whose meaning depends on the kind.
+RECORD = struct.Struct('<Bd5f')
+
+POSE = 1  # x, y, location error, heading, heading error
+DRIVE = 2  # forward, turn rate, left power, right power, common term
+STEER = 3  # relative bearing, steered heading error, mode, -, -
+
+STEER_AHEAD = 0
+STEER_RIGHT = 1
+STEER_LEFT = 2
+
+DEFAULT_CAPACITY = 8192
+DEFAULT_CONSOLE_INTERVAL = 1.0
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+
+class Telemetry:
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        console_interval: float = DEFAULT_CONSOLE_INTERVAL,
+    ) -> None:
+        self.capacity = capacity
+        self.console_interval = console_interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.written = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.console_times: Dict[str, float] = {}
+        self.stream: Optional[BinaryIO] = None
+        self.flusher: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+
+    def record(
+        self,
+        kind: int,
+        time: float,
+        a: float = 0.0,
+        b: float = 0.0,
+        c: float = 0.0,
+        d: float = 0.0,
+        e: float = 0.0,
+    ) -> None:
+        with self.lock:
+            offset = (self.written % self.capacity) * RECORD.size
+            RECORD.pack_into(self.buffer, offset, kind, time, a, b, c, d, e)
+            self.written += 1
+
+    def console(self, key: str, time: float) -> bool:
+        # Callers should only format a human-readable line when this says one
+        # is due, so the formatting cost is rate limited along with the output.
+        last = self.console_times.get(key)
+        if last is not None and 0 <= time - last < self.console_interval:
+            return False
+        self.console_times[key] = time
+        return True
+
+    def flush(self) -> None:
+        with self.lock:
+            start = max(self.flushed, self.written - self.capacity)
+            self.dropped += start - self.flushed
+            first = start % self.capacity
+            count = self.written - start
+            if first + count <= self.capacity:
+                chunk = bytes(self.buffer[first * RECORD.size:(first + count) * RECORD.size])
+            else:
+                wrapped = first + count - self.capacity
+                chunk = (
+                    bytes(self.buffer[first * RECORD.size:]) +
+                    bytes(self.buffer[:wrapped * RECORD.size])
+                )
+            self.flushed = self.written
+        if self.stream is not None and chunk:
+            self.stream.write(chunk)
+            self.stream.flush()
+
+    def start(self, path: str, interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        self.stop()
+        with self.lock:
+            # Only records from now on go to this file
+            self.flushed = self.written
+        self.stream = open(path, 'wb')
+        self.stopping.clear()
+        self.flusher = threading.Thread(
+            target=self._flush_loop,
+            args=(interval,),
+            name='telemetry-flusher',
+            daemon=True,
+        )
+        self.flusher.start()
+
+    def stop(self) -> None:
+        if self.flusher is not None:
+            self.stopping.set()
+            self.flusher.join()
+            self.flusher = None
+        if self.stream is not None:
+            self.flush()
+            self.stream.close()
+            self.stream = None
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self.stopping.wait(interval):
+            self.flush()
+
+
+def read_records(path: str) -> Iterator[Tuple[int, float, float, float, float, float, float]]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    for offset in range(0, len(data) - RECORD.size + 1, RECORD.size):
+        yield RECORD.unpack_from(data, offset)
+
+
+TELEMETRY = Telemetry()
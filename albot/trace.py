@@ -0,0 +1,171 @@
+import mmap
+import struct
+import dataclasses
+from typing import BinaryIO, Iterator, Optional, Sequence
+
+from sr.robot import StationCode
+from sr.robot.radio import Target
+
+from albot.view import View
+
+
+# A trace is a header followed by fixed-size records, one per control loop
+# tick, so any tick can be found by offset in a memory-mapped file.
+MAGIC = b'ALTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHB')
+
+# Robot time, motor powers, compass, ultrasound, reading times, flags and
+# the number of targets which follow
+TICK = struct.Struct('<dfffffdddBB')
+# Bearing, signal strength, station index and owner (-1 for unowned)
+TARGET = struct.Struct('<ffBb')
+MAX_TARGETS = len(StationCode)
+RECORD_SIZE = TICK.size + MAX_TARGETS * TARGET.size
+
+FLAG_PROXIMITY = 1
+FLAG_DROPPED = 2
+
+_STATION_INDEX = {station: index for index, station in enumerate(StationCode)}
+_STATIONS = tuple(StationCode)
+
+
+class TraceError(Exception):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class TraceRecord:
+    time: float
+    left_power: float
+    right_power: float
+    view: View
+
+
+class TraceRecorder:
+    def __init__(self, path: str, zone: int) -> None:
+        self.stream: Optional[BinaryIO] = open(path, 'wb')
+        self.stream.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, zone))
+        self.buffer = bytearray(RECORD_SIZE)
+        self.records = 0
+
+    def record(self, time: float, left_power: float, right_power: float, view: View) -> None:
+        if self.stream is None:
+            return
+        targets = view.targets[:MAX_TARGETS]
+        flags = (
+            (FLAG_PROXIMITY if view.proximity else 0) |
+            (FLAG_DROPPED if view.dropped else 0)
+        )
+        TICK.pack_into(
+            self.buffer,
+            0,
+            time,
+            left_power,
+            right_power,
+            view.compass,
+            view.left_distance,
+            view.right_distance,
+            view.compass_time,
+            view.targets_time,
+            view.proximity_time,
+            flags,
+            len(targets),
+        )
+        offset = TICK.size
+        for target in targets:
+            owner = target.target_info.owned_by
+            TARGET.pack_into(
+                self.buffer,
+                offset,
+                target.bearing,
+                target.signal_strength,
+                _STATION_INDEX[target.target_info.station_code],
+                -1 if owner is None else int(owner),
+            )
+            offset += TARGET.size
+        # Unused target slots keep stale bytes, which the count tells readers to ignore
+        self.stream.write(self.buffer)
+        self.records += 1
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class TraceReader:
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < HEADER.size:
+            raise TraceError(f"{path} is too short to be a trace")
+        magic, version, record_size, self.zone = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise TraceError(f"{path} is not a version {VERSION} trace")
+        # A trailing partial record means the robot died mid-write; ignore it
+        self.count = (len(self.data) - HEADER.size) // RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> TraceRecord:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._decode(HEADER.size + index * RECORD_SIZE)
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        for index in range(self.count):
+            yield self._decode(HEADER.size + index * RECORD_SIZE)
+
+    def close(self) -> None:
+        self.data.close()
+
+    def _decode(self, offset: int) -> TraceRecord:
+        # Imported here so that recording on the robot doesn't pull in the simulator
+        from albot.simulator import SimTarget, SimTargetInfo
+
+        (
+            time,
+            left_power,
+            right_power,
+            compass,
+            left_distance,
+            right_distance,
+            compass_time,
+            targets_time,
+            proximity_time,
+            flags,
+            count,
+        ) = TICK.unpack_from(self.data, offset)
+        targets: Sequence[Target] = [
+            SimTarget(
+                bearing=bearing,
+                signal_strength=signal_strength,
+                target_info=SimTargetInfo(
+                    station_code=_STATIONS[station],
+                    owned_by=None if owner < 0 else owner,
+                ),
+            )
+            for bearing, signal_strength, station, owner in TARGET.iter_unpack(
+                self.data[offset + TICK.size:offset + TICK.size + count * TARGET.size]
+            )
+        ]
+        return TraceRecord(
+            time=time,
+            left_power=left_power,
+            right_power=right_power,
+            view=View(
+                compass=compass,
+                targets=targets,
+                proximity=bool(flags & FLAG_PROXIMITY),
+                left_distance=left_distance,
+                right_distance=right_distance,
+                dropped=bool(flags & FLAG_DROPPED),
+                compass_time=compass_time,
+                targets_time=targets_time,
+                proximity_time=proximity_time,
+            ),
+        )
@@ -2,6 +2,7 @@ import math
 from sr.robot import Robot
 
 from albot.kalman import LEVER_ARM, MOTOR_LINEAR_SPEED
+from albot.telemetry import TELEMETRY, DRIVE
 
 def drive(robot: Robot, forward: float, turn_rate: float = 0.0) -> None:
     differential = -LEVER_ARM * turn_rate / MOTOR_LINEAR_SPEED
@@ -13,6 +14,9 @@ def drive(robot: Robot, forward: float, turn_rate: float = 0.0) -> None:
     common = min(max_common, common)
     left = 100 * (common - differential)
     right = 100 * (common + differential)
-    print(f"Desired: forward @ {forward:.2f}, turn rate @ {math.degrees(turn_rate):.1f}°/s; left={left:.1f}%, right={right:.1f}%; com={common:.3f} diff={differential:.3f}")
+    now = robot.time()
+    TELEMETRY.record(DRIVE, now, forward, turn_rate, left, right, common)
+    if TELEMETRY.console('drive', now):
+        print(f"Desired: forward @ {forward:.2f}, turn rate @ {math.degrees(turn_rate):.1f}°/s; left={left:.1f}%, right={right:.1f}%; com={common:.3f} diff={differential:.3f}")
     robot.motors[0].m0.power = left
     robot.motors[0].m1.power = right
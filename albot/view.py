@@ -1,4 +1,4 @@
-from typing import Sequence, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Sequence, Optional, Tuple, TypeVar
 
 import math
 import statistics
@@ -7,6 +7,17 @@ import dataclasses
 from sr.robot import Robot
 from sr.robot.radio import Target, StationCode
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from albot.sweeper import RadioSweeper
+
+T = TypeVar('T')
+
+
+DROP_TIME = 60.0
+MATCH_DURATION = 180.0
+
 
 @dataclasses.dataclass(frozen=True)
 class Location:
@@ -14,6 +25,24 @@ class Location:
     y: float
 
 
+# Mutable counterpart to Location, with a heading, for the estimator and
+# geometry hot paths to update in place. Turned into a Location only where a
+# position leaves them.
+class Pose:
+    __slots__ = ('x', 'y', 'heading')
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, heading: float = 0.0) -> None:
+        self.x = x
+        self.y = y
+        self.heading = heading
+
+    def location(self) -> Location:
+        return Location(x=self.x, y=self.y)
+
+    def __repr__(self) -> str:
+        return f"Pose(x={self.x!r}, y={self.y!r}, heading={self.heading!r})"
+
+
 STATION_CODE_LOCATIONS = {
     StationCode.BE: Location(x=0, y=-1.5),
     StationCode.BG: Location(x=-4.2, y=0),
@@ -45,25 +74,98 @@ class View:
     left_distance: float
     right_distance: float
     dropped: bool
+    # Capture time of each reading, on the robot clock
+    compass_time: float
+    targets_time: float
+    proximity_time: float
+
+
+def _timed(R: Robot, read: Callable[[], T]) -> Tuple[T, float]:
+    # Stamp a reading with the midpoint of the time taken to acquire it
+    start = R.time()
+    value = read()
+    return value, (start + R.time()) / 2
+
+
+def read_compass(R: Robot) -> Tuple[float, float]:
+    return _timed(R, R.compass.get_heading)
 
 
-def get_world_view(R: Robot) -> View:
-    compass = R.compass.get_heading()
-    targets = R.radio.sweep()
-    left_distance = R.ruggeduinos[0].analogue_read(0)
-    right_distance = R.ruggeduinos[0].analogue_read(1)
+def read_radio(R: Robot) -> Tuple[List[Target], float]:
+    return _timed(R, lambda: list(R.radio.sweep()))
+
+
+def read_ruggeduino(R: Robot) -> Tuple[Tuple[float, float, bool], float]:
+    # All on one board, so these are read together rather than in parallel
+    ruggeduino = R.ruggeduinos[0]
+    return _timed(R, lambda: (
+        ruggeduino.analogue_read(0),  # Front left ultrasound
+        ruggeduino.analogue_read(1),  # Front right ultrasound
+        ruggeduino.digital_read(2),  # Front bump switch
+    ))
+
+
+def _read_sweeper(sweeper: 'RadioSweeper') -> Tuple[List[Target], float]:
+    snapshot = sweeper.latest()
+    if snapshot is None:
+        return [], -math.inf
+    return list(snapshot.targets), snapshot.time
+
+
+def get_world_view(
+    R: Robot,
+    executor: Optional['Executor'] = None,
+    sweeper: Optional['RadioSweeper'] = None,
+) -> View:
+    # With a background sweeper, take whatever sweep it last published rather
+    # than blocking on the radio
+    if executor is None:
+        compass, compass_time = read_compass(R)
+        if sweeper is None:
+            targets, targets_time = read_radio(R)
+        else:
+            targets, targets_time = _read_sweeper(sweeper)
+        ruggeduino, proximity_time = read_ruggeduino(R)
+    else:
+        # Poll each source concurrently, so sensing takes roughly as long as
+        # the radio sweep rather than the sum of every read
+        compass_future = executor.submit(read_compass, R)
+        if sweeper is None:
+            radio_future = executor.submit(read_radio, R)
+        ruggeduino, proximity_time = read_ruggeduino(R)
+        compass, compass_time = compass_future.result()
+        if sweeper is None:
+            targets, targets_time = radio_future.result()
+        else:
+            targets, targets_time = _read_sweeper(sweeper)
+    return make_view(R, (compass, compass_time), (targets, targets_time), (ruggeduino, proximity_time))
+
+
+def make_view(
+    R: Robot,
+    compass_reading: Tuple[float, float],
+    radio_reading: Tuple[Sequence[Target], float],
+    ruggeduino_reading: Tuple[Tuple[float, float, bool], float],
+) -> View:
+    # From timestamped readings, however they were taken
+    compass, compass_time = compass_reading
+    targets, targets_time = radio_reading
+    (left_distance, right_distance, bumped), proximity_time = ruggeduino_reading
     proximity = (
-        left_distance < 0.05 or  # Front left ultrasound
-        right_distance < 0.05 or  # Front right ultrasound
-        R.ruggeduinos[0].digital_read(2)  # Front bump switch
+        left_distance < 0.05 or
+        right_distance < 0.05 or
+        bumped
     )
     return View(
         compass=compass,
-        targets=list(targets),
+        targets=targets,
         proximity=proximity,
         left_distance=left_distance,
         right_distance=right_distance,
-        dropped=R.time() > 60.0,
+        dropped=R.time() > DROP_TIME,
+        compass_time=compass_time,
+        targets_time=targets_time,
+        proximity_time=proximity_time,
     )
 
 
@@ -71,12 +173,18 @@ def get_station_location(station_code: StationCode) -> Location:
     return STATION_CODE_LOCATIONS[station_code]
 
 
-def single_target_position(heading: float, target: Target) -> Location:
+def single_target_fix(fix: Pose, heading: float, target: Target) -> None:
+    # Where we'd be for the target to appear as it does, written into fix
     absolute_bearing = heading + target.bearing
     #print(f"Absolute bearing to {target.target_info.station_code} is {math.degrees(absolute_bearing):.0f}°, distance is {1.0 / target.signal_strength:.2f}m")
     distance = target.signal_strength ** -0.5
-    station_location = get_station_location(target.target_info.station_code)
-    return Location(
-        x=station_location.x - distance * math.sin(absolute_bearing),
-        y=station_location.y - distance * math.cos(absolute_bearing),
-    )
+    station_location = STATION_CODE_LOCATIONS[target.target_info.station_code]
+    fix.x = station_location.x - distance * math.sin(absolute_bearing)
+    fix.y = station_location.y - distance * math.cos(absolute_bearing)
+    fix.heading = heading
+
+
+def single_target_position(heading: float, target: Target) -> Location:
+    fix = Pose()
+    single_target_fix(fix, heading, target)
+    return fix.location()
@@ -3,42 +3,32 @@ import math
 from sr.robot import Robot
 
 from albot.state import State
-from albot.view import View, single_target_position
-from albot.navmesh import get_zone
+from albot.view import View
+from albot.navmesh import get_zone_at
+from albot.stations import STATION_BITS, StationSet
 from albot.nerf import NERF_MODE
-
-import collections
-import dataclasses
+from albot.telemetry import TELEMETRY, POSE
 
 
 def update_state_from_view(robot: Robot, state: State, view: View) -> None:
     # Update captured
-    new_captured = set(state.captured)
+    captured_mask = state.captured.mask
     for target in view.targets:
         if target.target_info.owned_by == state.zone:
-            new_captured.add(target.target_info.station_code)
+            captured_mask |= STATION_BITS[target.target_info.station_code]
         else:
             if not NERF_MODE:
                 # In nerf mode we pretend we're unaware of zones taken away from us
-                new_captured.discard(target.target_info.station_code)
-    state.captured = new_captured
+                captured_mask &= ~STATION_BITS[target.target_info.station_code]
+    if captured_mask != state.captured.mask:
+        state.captured = StationSet.from_mask(captured_mask)
+        state.decisions.invalidate()
 
     # Zone updating
-    zone_list = list(state.zone_history)
-    zone_list.append(get_zone(state.kalman.location))
-
-    if len(zone_list) > 4:
-        zone_list = zone_list[-4:]
-    state.zone_history = zone_list
-
-    zones = collections.Counter(zone_list)
-    zones.update([zone_list[-1]])
-
-    (element, num_instances), = zones.most_common(1)
-    if num_instances > 1:
-        state.current_zone = element
-    else:
-        state.current_zone = None
+    current_zone = state.zone_history.push(get_zone_at(state.kalman.x, state.kalman.y))
+    if current_zone is not state.current_zone:
+        state.current_zone = current_zone
+        state.decisions.invalidate()
 
     time = robot.time()
     state.kalman.tick(
@@ -47,12 +37,27 @@ def update_state_from_view(robot: Robot, state: State, view: View) -> None:
         right_power=robot.motors[0].m1.power,
     )
     state.kalman.update_heading(view.compass)
-    for target in view.targets:
-        state.kalman.update_location(
-            location=single_target_position(state.kalman.heading, target),
-            stdev=0.08,
-        )
+    # A background sweeper can hand us the same sweep on several ticks; only
+    # fuse each one once
+    if view.targets_time > state.sweep_time:
+        state.kalman.update_targets(view.targets)
+        flips = state.opponent.flips
+        state.opponent.observe(view.targets, view.targets_time)
+        if state.opponent.flips != flips:
+            # A station changed hands to the other robot, so check our target again
+            state.decisions.invalidate()
+        state.sweep_time = view.targets_time
     state.kalman_time = time
 
-    print(f"Position is {state.kalman.location.x:.3f}, {state.kalman.location.y:.3f} ±{state.kalman.location_error:.3f}m")
-    print(f"Heading is {math.degrees(state.kalman.heading):.0f}° ±{math.degrees(state.kalman.heading_error):.0f}°")
+    TELEMETRY.record(
+        POSE,
+        time,
+        state.kalman.x,
+        state.kalman.y,
+        state.kalman.location_error,
+        state.kalman.heading,
+        state.kalman.heading_error,
+    )
+    if TELEMETRY.console('pose', time):
+        print(f"Position is {state.kalman.x:.3f}, {state.kalman.y:.3f} ±{state.kalman.location_error:.3f}m")
+        print(f"Heading is {math.degrees(state.kalman.heading):.0f}° ±{math.degrees(state.kalman.heading_error):.0f}°")
@@ -0,0 +1,168 @@
+import os
+import math
+import argparse
+import itertools
+import contextlib
+import statistics
+import dataclasses
+from typing import Callable, List, Sequence
+
+from albot.pid import PIDController, DiscretePIDController
+from albot.utils import drive
+from albot.actions import FORWARD_POWER, FULL_DEFLECTION_TURN_RATE_PER_SECOND
+from albot.simulator import SimulatedRobot
+
+
+# Step response of heading control as GoRelative drives it: moving ahead at
+# FORWARD_POWER and steering with the PID's deflection, starting off course
+STEP_ERRORS = (math.radians(40), math.radians(-40), math.radians(20), math.radians(-20))
+TEST_DURATION = 5.0
+# Settled once the error stays inside this band
+SETTLING_BAND = math.radians(3)
+
+
+@dataclasses.dataclass(frozen=True)
+class Gains:
+    full_deflection_error: float
+    prediction_time: float
+    fine_tune_time: float
+
+    def __str__(self) -> str:
+        return (
+            f"full deflection {math.degrees(self.full_deflection_error):.0f}°, "
+            f"prediction {self.prediction_time:.2f}s, "
+            f"fine tune {self.fine_tune_time:.1f}s"
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class StepResponse:
+    settling_time: float
+    overshoot: float
+    reversals: int
+
+
+def step_response(
+    make_controller: Callable[[SimulatedRobot], object],
+    initial_error: float,
+    period: float,
+    seed: int,
+) -> StepResponse:
+    robot = SimulatedRobot(zone=0, seed=seed, duration=TEST_DURATION + 1)
+    # Somewhere with room to move, pointing along the arena
+    robot.x, robot.y = -2.0, 2.2
+    target = math.radians(90)
+    robot.heading = (target - initial_error) % math.tau
+    controller = make_controller(robot)
+
+    errors: List[float] = []
+    times: List[float] = []
+    last_sign = 0
+    reversals = 0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        while robot.time() < TEST_DURATION:
+            # The controller is never stepped at the instant it's created
+            robot.sleep(period)
+            times.append(robot.time())
+            errors.append((target - robot.heading + math.pi) % math.tau - math.pi)
+            measured_error = (target - robot.compass.get_heading() + math.pi) % math.tau - math.pi
+            deflection = controller.step(measured_error)
+            drive(robot, FORWARD_POWER, FULL_DEFLECTION_TURN_RATE_PER_SECOND * deflection)
+            sign = (deflection > 0.05) - (deflection < -0.05)
+            if sign and last_sign and sign != last_sign:
+                reversals += 1
+            if sign:
+                last_sign = sign
+
+    settling_time = 0.0
+    for time, error in zip(times, errors):
+        if abs(error) > SETTLING_BAND:
+            settling_time = time
+    # Overshoot is how far the heading goes past the target, as a fraction of
+    # the initial error
+    overshoot = max(0.0, max(-error * math.copysign(1, initial_error) for error in errors))
+    return StepResponse(
+        settling_time=settling_time,
+        overshoot=overshoot / abs(initial_error),
+        reversals=reversals,
+    )
+
+
+def evaluate(
+    controller_type: type,
+    gains: Gains,
+    period: float,
+    seeds: Sequence[int],
+) -> StepResponse:
+    responses = [
+        step_response(
+            lambda robot: controller_type(
+                full_deflection_error=gains.full_deflection_error,
+                prediction_time=gains.prediction_time,
+                fine_tune_time=gains.fine_tune_time,
+                time=robot.time,
+            ),
+            initial_error,
+            period,
+            seed,
+        )
+        for initial_error in STEP_ERRORS
+        for seed in seeds
+    ]
+    return StepResponse(
+        settling_time=statistics.mean(x.settling_time for x in responses),
+        overshoot=statistics.mean(x.overshoot for x in responses),
+        reversals=round(statistics.mean(x.reversals for x in responses)),
+    )
+
+
+def describe(name: str, response: StepResponse) -> str:
+    return (
+        f"{name}: settles in {response.settling_time:.2f}s, "
+        f"overshoot {response.overshoot:.0%}, "
+        f"{response.reversals} reversals"
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sweep heading PID gains against the simulator")
+    parser.add_argument('--period', type=float, default=0.01, help="control loop period, in seconds")
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    seeds = range(args.seeds)
+    # As configured for State.heading_pid in albot.state, and as it was with
+    # PIDController before the switch to DiscretePIDController
+    current = Gains(
+        full_deflection_error=math.radians(120),
+        prediction_time=0.3,
+        fine_tune_time=8.0,
+    )
+    previous = Gains(
+        full_deflection_error=math.radians(120),
+        prediction_time=0.3,
+        fine_tune_time=2.0,
+    )
+    print(describe(f"PIDController, previous gains ({previous})", evaluate(PIDController, previous, args.period, seeds)))
+    print(describe(f"DiscretePIDController, previous gains ({previous})", evaluate(DiscretePIDController, previous, args.period, seeds)))
+    print(describe(f"DiscretePIDController, current gains ({current})", evaluate(DiscretePIDController, current, args.period, seeds)))
+
+    results = []
+    for full_deflection, prediction_time, fine_tune_time in itertools.product(
+        (30, 45, 60, 90, 120),
+        (0.0, 0.1, 0.2, 0.3, 0.5),
+        (1.0, 2.0, 4.0, 8.0),
+    ):
+        gains = Gains(
+            full_deflection_error=math.radians(full_deflection),
+            prediction_time=prediction_time,
+            fine_tune_time=fine_tune_time,
+        )
+        results.append((evaluate(DiscretePIDController, gains, args.period, seeds), gains))
+
+    # Settling time first, with overshoot as the tie break
+    results.sort(key=lambda x: (round(x[0].settling_time, 2), x[0].overshoot))
+    print(f"Best of {len(results)} gain sets for DiscretePIDController at a {args.period}s period:")
+    for response, gains in results[:args.top]:
+        print(describe(f"  {gains}", response))
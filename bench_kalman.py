@@ -0,0 +1,143 @@
+import math
+import time
+import argparse
+from typing import Sequence
+
+from sr.robot.radio import Target
+
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.kalman import (
+    KalmanFilter,
+    MOTOR_LINEAR_SPEED,
+    MOTOR_LINEAR_SPEED_STDEV,
+    LEVER_ARM,
+    HEADING_ERROR_PER_SECOND,
+    compass_stdev_by_heading,
+)
+from albot.simulator import SimulatedRobot
+
+
+# The implementation KalmanFilter replaced, which builds a new Location for
+# every update, for comparison
+def location_target_position(heading: float, target: Target) -> Location:
+    absolute_bearing = heading + target.bearing
+    distance = target.signal_strength ** -0.5
+    station_location = STATION_CODE_LOCATIONS[target.target_info.station_code]
+    return Location(
+        x=station_location.x - distance * math.sin(absolute_bearing),
+        y=station_location.y - distance * math.cos(absolute_bearing),
+    )
+
+
+class LocationKalmanFilter:
+    def __init__(self, initial_position: Location, initial_heading: float) -> None:
+        self.location = initial_position
+        self.location_error = 0.1
+        self.heading = initial_heading
+        self.heading_error = compass_stdev_by_heading(self.heading)
+
+    def tick(self, dt: float, left_power: float, right_power: float) -> None:
+        left_velocity = MOTOR_LINEAR_SPEED * left_power / 100
+        right_velocity = MOTOR_LINEAR_SPEED * right_power / 100
+        surge = (left_velocity + right_velocity) * 0.5
+        rotation = (left_velocity - right_velocity) / LEVER_ARM
+        self.location = Location(
+            x=self.location.x + surge * math.sin(self.heading) * dt,
+            y=self.location.y + surge * math.cos(self.heading) * dt,
+        )
+        self.location_error += MOTOR_LINEAR_SPEED_STDEV * dt * (0.1 + abs(surge) / MOTOR_LINEAR_SPEED)
+        self.heading = (self.heading + rotation * dt) % math.tau
+        self.heading_error += (MOTOR_LINEAR_SPEED_STDEV / LEVER_ARM) * dt
+        self.heading_error += HEADING_ERROR_PER_SECOND * dt
+
+    def update_heading(self, compass: float) -> None:
+        err_θ = compass - self.heading
+        err_θ = (err_θ + math.pi) % math.tau - math.pi
+        kalman_gain = self.heading_error / (self.heading_error + abs(err_θ) + compass_stdev_by_heading(self.heading))
+        self.heading += kalman_gain * err_θ
+        self.heading = self.heading % math.tau
+        self.heading_error *= 1 - kalman_gain
+
+    def update_location(self, location: Location, stdev: float) -> None:
+        err_x = location.x - self.location.x
+        err_y = location.y - self.location.y
+        overall_error = math.hypot(err_x, err_y)
+        kalman_gain = self.location_error / (self.location_error + overall_error + stdev)
+        self.location = Location(
+            x=self.location.x + kalman_gain * err_x,
+            y=self.location.y + kalman_gain * err_y,
+        )
+        self.location_error *= 1 - kalman_gain
+
+    def update_targets(self, targets: Sequence[Target]) -> None:
+        for target in targets:
+            self.update_location(
+                location=location_target_position(self.heading, target),
+                stdev=0.08,
+            )
+
+
+parser = argparse.ArgumentParser(description="Benchmark the Kalman filter's updates")
+parser.add_argument('--iterations', type=int, default=100000)
+args = parser.parse_args()
+
+# A representative sweep from near the pink start
+robot = SimulatedRobot(seed=0)
+robot.x, robot.y = -5.0, -1.0
+sweep = robot.radio.sweep()
+compass = robot.compass.get_heading()
+fix = Location(x=-5.1, y=-0.9)
+
+
+def new_estimator(implementation):
+    return implementation(initial_position=Location(x=-5.0, y=-1.0), initial_heading=robot.heading)
+
+
+def run_sequence(estimator) -> None:
+    for step in range(50):
+        estimator.tick(dt=0.01, left_power=60, right_power=55 - step)
+        estimator.update_heading(compass)
+        if step % 5 == 0:
+            estimator.update_targets(sweep)
+        if step % 10 == 0:
+            estimator.update_location(fix, stdev=0.08)
+
+
+# Both should give exactly the same estimates
+expected = new_estimator(LocationKalmanFilter)
+actual = new_estimator(KalmanFilter)
+run_sequence(expected)
+run_sequence(actual)
+for name in ('location', 'heading', 'location_error', 'heading_error'):
+    if getattr(expected, name) != getattr(actual, name):
+        raise AssertionError(f"Mismatch in {name}: {getattr(expected, name)} != {getattr(actual, name)}")
+
+
+def per_call(operation) -> float:
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        operation()
+    return (time.perf_counter() - start) / args.iterations
+
+
+def time_updates(estimator):
+    return (
+        ('tick', per_call(lambda: estimator.tick(dt=0.01, left_power=60, right_power=55))),
+        ('update_heading', per_call(lambda: estimator.update_heading(compass))),
+        ('update_location', per_call(lambda: estimator.update_location(fix, stdev=0.08))),
+        (f'update_targets ({len(sweep)} targets)', per_call(lambda: estimator.update_targets(sweep))),
+    )
+
+
+cycles = {}
+for name, implementation in (
+    ('Location', LocationKalmanFilter),
+    ('in place', KalmanFilter),
+):
+    results = time_updates(new_estimator(implementation))
+    print(f"{name}:")
+    for update, elapsed in results:
+        print(f"  {update}: {elapsed * 1e6:.2f}µs per call")
+    cycles[name] = results[0][1] + results[1][1] + results[3][1]
+    print(f"  Tick, heading and sweep: {cycles[name] * 1e6:.2f}µs per cycle, {1 / cycles[name]:.0f} cycles per second")
+print(f"Speed-up: {cycles['Location'] / cycles['in place']:.1f}x")
@@ -0,0 +1,51 @@
+import time
+import argparse
+
+from albot.view import Location
+from albot.kalman import KalmanFilter
+from albot.ekf import PoseKalmanFilter
+from albot.particle_filter import ParticleFilter
+from albot.simulator import SimulatedRobot
+
+
+parser = argparse.ArgumentParser(description="Benchmark localisation engines on simulated sweeps")
+parser.add_argument('--iterations', type=int, default=200)
+parser.add_argument('--particles', type=int, nargs='+', default=[500, 1000, 2000, 5000, 10000])
+args = parser.parse_args()
+
+# A representative sweep from near the pink start
+robot = SimulatedRobot(seed=0)
+robot.x, robot.y = -5.0, -1.0
+sweep = robot.radio.sweep()
+compass = robot.compass.get_heading()
+print(f"Sweep has {len(sweep)} targets")
+
+
+def benchmark(estimator) -> float:
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        estimator.tick(dt=0.01, left_power=60, right_power=55)
+        estimator.update_heading(compass)
+        estimator.update_targets(sweep)
+    return (time.perf_counter() - start) / args.iterations
+
+
+initial_position = Location(x=-5.0, y=-1.0)
+initial_heading = robot.heading
+
+for name, factory in (
+    ('kalman', KalmanFilter),
+    ('ekf', PoseKalmanFilter),
+):
+    per_cycle = benchmark(factory(initial_position=initial_position, initial_heading=initial_heading))
+    print(f"{name}: {1000 * per_cycle:.3f}ms per cycle")
+
+for count in args.particles:
+    estimator = ParticleFilter(
+        initial_position=initial_position,
+        initial_heading=initial_heading,
+        count=count,
+        seed=0,
+    )
+    per_cycle = benchmark(estimator)
+    print(f"particle N={count}: {1000 * per_cycle:.3f}ms per cycle, {count / (1000 * per_cycle):.0f} particles/ms")
@@ -0,0 +1,38 @@
+import time
+import random
+
+from sr.robot import StationCode
+
+from albot.view import Location
+from albot.pathfinding import build_grid, distance_field, next_waypoint, plan_path, GRID_COLUMNS, GRID_ROWS
+
+
+start = time.perf_counter()
+for dropped in (False, True):
+    build_grid(dropped)
+grid_time = time.perf_counter() - start
+print(f"Built {GRID_COLUMNS}x{GRID_ROWS} grids in {grid_time * 1000:.0f}ms")
+
+start = time.perf_counter()
+for dropped in (False, True):
+    for station in StationCode:
+        distance_field(station, dropped)
+field_time = time.perf_counter() - start
+print(f"Built {2 * len(StationCode)} distance fields in {field_time * 1000:.0f}ms ({field_time / (2 * len(StationCode)) * 1000:.1f}ms each)")
+
+rng = random.Random(0)
+queries = [
+    (
+        Location(x=rng.uniform(-7, 7), y=rng.uniform(-3.5, 3.5)),
+        rng.choice(list(StationCode)),
+        rng.random() < 0.5,
+    )
+    for _ in range(5000)
+]
+
+for name, function in (('next_waypoint (cold)', next_waypoint), ('next_waypoint (warm)', next_waypoint), ('plan_path', plan_path)):
+    start = time.perf_counter()
+    for location, station, dropped in queries:
+        function(location, station, dropped)
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {elapsed / len(queries) * 1e6:.1f}µs per query")
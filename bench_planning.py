@@ -0,0 +1,55 @@
+import math
+import random
+import timeit
+
+from sr.robot import StationCode
+
+from albot.view import Location, STATION_CODE_LOCATIONS
+from albot.navmesh import get_zone, get_next_hop, ZONE_CENTRES
+from albot.planning import effective_distance
+
+
+# The recursive implementation effective_distance replaced, for comparison
+def recursive_effective_distance(from_location: Location, to_location: Location, dropped: bool) -> float:
+    from_zone = get_zone(from_location)
+    next_hop, is_direct = get_next_hop(from_zone, to_location, dropped)
+    if is_direct:
+        return math.hypot(to_location.x - from_location.x, to_location.y - from_location.y)
+    intermediate = ZONE_CENTRES[next_hop]
+    intermediate_distance = math.hypot(intermediate.x - from_location.x, intermediate.y - from_location.y)
+    return intermediate_distance + recursive_effective_distance(intermediate, to_location, dropped)
+
+
+def evaluate_candidates(distance_function, positions, dropped):
+    for position in positions:
+        for station in StationCode:
+            distance_function(position, STATION_CODE_LOCATIONS[station], dropped)
+
+
+rng = random.Random(0)
+positions = [
+    Location(x=rng.uniform(-7, 7), y=rng.uniform(-3.5, 3.5))
+    for _ in range(500)
+]
+
+for dropped in (False, True):
+    for position in positions:
+        for station in StationCode:
+            expected = recursive_effective_distance(position, STATION_CODE_LOCATIONS[station], dropped)
+            actual = effective_distance(position, STATION_CODE_LOCATIONS[station], dropped)
+            if not math.isclose(expected, actual, rel_tol=1e-9):
+                raise AssertionError(f"Mismatch from {position} to {station}: {expected} != {actual}")
+
+    timings = {}
+    for name, function in (
+        ('recursive', recursive_effective_distance),
+        ('precomputed', effective_distance),
+    ):
+        runs = timeit.repeat(
+            lambda: evaluate_candidates(function, positions, dropped),
+            number=5,
+            repeat=5,
+        )
+        timings[name] = min(runs) / (5 * len(positions))
+        print(f"{'Post' if dropped else 'Pre'}-drop {name}: {1e6 * timings[name]:.1f}µs per full candidate set of {len(StationCode)} stations")
+    print(f"  Speed-up: {timings['recursive'] / timings['precomputed']:.1f}x")
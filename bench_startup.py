@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import collections
+from typing import Dict, List, Tuple
+
+
+# Run in a fresh interpreter each time so that nothing is already imported.
+# The simulator stands in for the robot; it's imported after albot.main so it
+# doesn't count towards the import time.
+CHILD = '''
+import os
+import sys
+import json
+import time
+import contextlib
+
+start = time.perf_counter()
+import albot.main
+imported = time.perf_counter()
+
+from albot.simulator import SimulatedRobot
+
+
+class FirstDrive(Exception):
+    pass
+
+
+class FirstDriveChannel:
+    @property
+    def power(self):
+        return 0.0
+
+    @power.setter
+    def power(self, value):
+        raise FirstDrive()
+
+
+prepare_time = 0.0
+if sys.argv[1] == 'prepared':
+    prepare_start = time.perf_counter()
+    albot.main.prepare()
+    prepare_time = time.perf_counter() - prepare_start
+
+robot = SimulatedRobot(zone=0, seed=0)
+robot.motors[0].m0 = FirstDriveChannel()
+robot.motors[0].m1 = FirstDriveChannel()
+with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    run_start = time.perf_counter()
+    try:
+        albot.main.run(robot)
+    except FirstDrive:
+        pass
+    first_drive = time.perf_counter()
+
+json.dump({
+    'import': imported - start,
+    'prepare': prepare_time,
+    'run': first_drive - run_start,
+    'robot_time': robot.time(),
+}, sys.stdout)
+'''
+
+
+def parse_import_times(stderr: str) -> Dict[str, Tuple[int, int]]:
+    # Self and cumulative microseconds per module, from -X importtime, for
+    # everything imported along with albot.main
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+        if name.strip() == 'albot.main':
+            break
+    return times
+
+
+parser = argparse.ArgumentParser(description="Measure cold start, from importing albot.main to the first drive")
+parser.add_argument('--runs', type=int, default=5)
+parser.add_argument('--top', type=int, default=10, help="number of other modules to list by import time")
+args = parser.parse_args()
+
+results: Dict[str, List[Dict[str, float]]] = collections.defaultdict(list)
+module_times: Dict[str, List[Tuple[int, int]]] = collections.defaultdict(list)
+for _ in range(args.runs):
+    # Straight into the match, and with the tables prepared beforehand as
+    # robot.py does while it waits for the start signal
+    for mode in ('cold', 'prepared'):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', CHILD, mode],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        results[mode].append(json.loads(completed.stdout))
+        for name, times in parse_import_times(completed.stderr).items():
+            module_times[name].append(times)
+
+
+def median(mode: str, key: str) -> float:
+    return statistics.median(x[key] for x in results[mode])
+
+
+import_time = median('cold', 'import')
+print(f"Median of {args.runs} runs, in wall time:")
+print(f"  import albot.main: {import_time * 1000:.1f}ms")
+print(f"  cold, run() to first drive: {median('cold', 'run') * 1000:.1f}ms, {(import_time + median('cold', 'run')) * 1000:.1f}ms from import")
+print(f"  prepare(): {median('prepared', 'prepare') * 1000:.1f}ms")
+print(f"  prepared, run() to first drive: {median('prepared', 'run') * 1000:.1f}ms")
+# The simulator skips over sleeps and sensor reads, which take real time on the robot
+print(f"  plus {median('cold', 'robot_time') * 1000:.0f}ms of robot time before the first drive")
+
+medians = {
+    name: (
+        statistics.median(x[0] for x in times),
+        statistics.median(x[1] for x in times),
+    )
+    for name, times in module_times.items()
+}
+print("albot modules, self and cumulative import time:")
+for name, (self_us, cumulative_us) in sorted(medians.items(), key=lambda x: -x[1][1]):
+    if name == 'albot' or name.startswith('albot.'):
+        print(f"  {name:<28} {self_us / 1000:6.1f}ms {cumulative_us / 1000:6.1f}ms")
+print(f"Slowest {args.top} other modules by self time:")
+others = [x for x in medians.items() if not (x[0] == 'albot' or x[0].startswith('albot.'))]
+for name, (self_us, cumulative_us) in sorted(others, key=lambda x: -x[1][0])[:args.top]:
+    print(f"  {name:<28} {self_us / 1000:6.1f}ms {cumulative_us / 1000:6.1f}ms")
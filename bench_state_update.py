@@ -0,0 +1,121 @@
+import gc
+import os
+import math
+import time
+import contextlib
+import tracemalloc
+from typing import List, Tuple
+
+from albot.view import View, get_world_view
+from albot.state import initial_state
+from albot.simulator import SimulatedRobot
+from albot.telemetry import TELEMETRY
+from albot.view_state_update import update_state_from_view
+
+
+WARMUP_TICKS = 200
+MEASURED_TICKS = 2000
+# The last value of each per-tick float, such as the latest time kept by
+# telemetry or the estimator, is allocated during a pass and outlives it; a
+# handful of those is all a pass may leave behind, however many ticks it runs
+RETAINED_BYTES_LIMIT = 256
+RETAINED_OBJECTS_LIMIT = 8
+
+
+class ClockMotorChannel:
+    def __init__(self) -> None:
+        self.power = 0.0
+
+
+class ClockMotorBoard:
+    def __init__(self) -> None:
+        self.m0 = ClockMotorChannel()
+        self.m1 = ClockMotorChannel()
+
+
+# Just enough of a robot for update_state_from_view: a settable clock and
+# motor powers
+class ClockRobot:
+    def __init__(self, zone: int) -> None:
+        self.zone = zone
+        self.motors = [ClockMotorBoard()]
+        self._time = 0.0
+
+    def time(self) -> float:
+        return self._time
+
+    def set_tick(self, time: float, left_power: float, right_power: float) -> None:
+        self._time = time
+        self.motors[0].m0.power = left_power
+        self.motors[0].m1.power = right_power
+
+
+def collect_ticks(count: int) -> List[Tuple[float, float, float, View]]:
+    # Sensor readings from the simulator driving a slow loop around the arena
+    robot = SimulatedRobot(zone=0, seed=0, duration=1e9)
+    ticks = []
+    for index in range(count):
+        left, right = (60.0, 40.0) if index % 400 < 200 else (40.0, 60.0)
+        robot.motors[0].m0.power = left
+        robot.motors[0].m1.power = right
+        ticks.append((robot.time(), left, right, get_world_view(robot)))
+        robot.sleep(0.01)
+    return ticks
+
+
+ticks = collect_ticks(WARMUP_TICKS + MEASURED_TICKS)
+robot = ClockRobot(zone=0)
+robot.set_tick(ticks[0][0], 0.0, 0.0)
+state = initial_state(robot)
+
+
+def run_ticks(ticks: List[Tuple[float, float, float, View]], offset: float) -> None:
+    # Passes over the same ticks are offset in time so the clock never goes
+    # backwards
+    for time_, left, right, view in ticks:
+        robot.set_tick(time_ + offset, left, right)
+        update_state_from_view(robot, state, view)
+
+
+warmup = ticks[:WARMUP_TICKS]
+measured = ticks[WARMUP_TICKS:]
+span = ticks[-1][0]
+
+
+with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+    run_ticks(warmup, 0.0)
+    # The once a second console lines are buffered by the output stream,
+    # which would show up as retained memory here
+    TELEMETRY.console_interval = math.inf
+
+    start = time.perf_counter()
+    run_ticks(measured, 0.0)
+    elapsed = time.perf_counter() - start
+
+    # Objects the cyclic collector tracks, net of those freed; this count is
+    # what triggers a collection
+    gc.collect()
+    gc.disable()
+    before = gc.get_count()[0]
+    run_ticks(measured, span)
+    tracked = gc.get_count()[0] - before
+    gc.enable()
+
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    run_ticks(measured, 2 * span)
+    current, peak = tracemalloc.get_traced_memory()
+    difference = tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    tracemalloc.stop()
+
+net_bytes = sum(
+    x.size_diff
+    for x in difference
+    if f'{os.sep}albot{os.sep}' in x.traceback[0].filename
+)
+print(f"update_state_from_view: {elapsed / MEASURED_TICKS * 1e6:.1f}µs per tick")
+print(f"Net allocations over {MEASURED_TICKS} ticks: {net_bytes} bytes, {tracked} GC-tracked objects")
+print(f"Peak transient allocation: {peak - current} bytes")
+assert net_bytes <= RETAINED_BYTES_LIMIT, "the state update retains memory in steady state"
+assert tracked <= RETAINED_OBJECTS_LIMIT, "the state update leaves new GC-tracked objects behind"
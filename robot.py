@@ -1,6 +1,12 @@
-from albot.main import run
+import threading
+
+from albot.main import run, prepare
 from sr.robot import Robot
 
+# Robot() waits for the start signal, so build what the first decisions need
+# in the meantime
+warm_up = threading.Thread(target=prepare, daemon=True)
+warm_up.start()
 robot = Robot()
+warm_up.join()
 run(robot)
-
@@ -0,0 +1,44 @@
+import argparse
+import statistics
+
+from albot.state import LOCALISATION_ENGINES
+from albot.simulator import run_match
+from albot.profiling import Profiler, print_summary
+
+
+parser = argparse.ArgumentParser(description="Run simulated matches")
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--matches', type=int, default=1)
+parser.add_argument('--zone', type=int, choices=(0, 1), default=0)
+parser.add_argument('--localisation', choices=LOCALISATION_ENGINES, default='kalman')
+parser.add_argument('--verbose', action='store_true')
+parser.add_argument('--profile', action='store_true', help="time each stage of the control loop across all matches")
+parser.add_argument('--opponent', action='store_true', help="add a scripted robot claiming for the other zone")
+parser.add_argument('--runtime', choices=('sync', 'async'), default='sync', help="run the control loop synchronously, or as concurrent async stages")
+parser.add_argument('--real-time-factor', type=float, help="run against the wall clock sped up by this factor, rather than in virtual time; the async runtime always does")
+parser.add_argument('--trace', help="record a sensor trace per match, e.g. trace-{seed}.bin")
+args = parser.parse_args()
+
+profiler = Profiler() if args.profile else None
+results = []
+for seed in range(args.seed, args.seed + args.matches):
+    result = run_match(
+        seed=seed,
+        zone=args.zone,
+        quiet=not args.verbose,
+        localisation=args.localisation,
+        trace_path=None if args.trace is None else args.trace.format(seed=seed),
+        profiler=profiler,
+        opponent=args.opponent,
+        runtime=args.runtime,
+        real_time_factor=args.real_time_factor,
+    )
+    results.append(result)
+    captured = ', '.join(f"{station.value}@{t:.0f}s" for t, station in result.captures)
+    print(f"Seed {seed}: score {result.score}, {len(result.captures)} captures ({captured}), {len(result.held)} held, {result.time_per_capture:.1f}s per capture, {result.wall_time:.3f}s wall")
+
+if len(results) > 1:
+    print(f"Mean score {statistics.mean(x.score for x in results):.2f}, mean time per capture {statistics.mean(x.time_per_capture for x in results):.1f}s, mean wall time {statistics.mean(x.wall_time for x in results):.3f}s")
+
+if profiler is not None:
+    print_summary(profiler)
@@ -0,0 +1,158 @@
+import os
+import json
+import math
+import random
+import argparse
+import itertools
+import statistics
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Sequence, Tuple
+
+from sr.robot import StationCode
+
+import albot.planning
+import albot.decisions
+from albot.simulator import run_match
+
+
+@dataclasses.dataclass(frozen=True)
+class Configuration:
+    high_value_targets: Tuple[str, ...]
+    high_value_discount: float
+    high_value_weight: float
+    capture_count_penalty: float
+    banned_targets: Tuple[str, ...]
+
+
+def current_configuration() -> Configuration:
+    return Configuration(
+        high_value_targets=tuple(x.value for x in albot.planning.HIGH_VALUE_TARGETS),
+        high_value_discount=albot.planning.HIGH_VALUE_DISCOUNT,
+        high_value_weight=albot.planning.HIGH_VALUE_WEIGHT,
+        capture_count_penalty=albot.decisions.CAPTURE_COUNT_PENALTY,
+        banned_targets=tuple(x.value for x in albot.planning.BANNED_TARGETS),
+    )
+
+
+def apply_configuration(configuration: Configuration) -> None:
+    # Each worker process has its own copy of these modules
+    albot.planning.HIGH_VALUE_TARGETS = [StationCode(x) for x in configuration.high_value_targets]
+    albot.planning.HIGH_VALUE_DISCOUNT = configuration.high_value_discount
+    albot.planning.HIGH_VALUE_WEIGHT = configuration.high_value_weight
+    albot.planning.BANNED_TARGETS = [StationCode(x) for x in configuration.banned_targets]
+    albot.decisions.CAPTURE_COUNT_PENALTY = configuration.capture_count_penalty
+
+
+def evaluate(configuration: Configuration, seeds: Sequence[int]) -> List[Tuple[int, int]]:
+    apply_configuration(configuration)
+    results = []
+    for seed in seeds:
+        # Alternate starting zones so both sides of the arena are covered
+        result = run_match(seed=seed, zone=seed % 2)
+        results.append((result.score, len(result.captures)))
+    return results
+
+
+def grid_configurations(baseline: Configuration) -> List[Configuration]:
+    return [
+        Configuration(
+            high_value_targets=high_value_targets,
+            high_value_discount=discount,
+            high_value_weight=weight,
+            capture_count_penalty=penalty,
+            banned_targets=banned_targets,
+        )
+        for high_value_targets, discount, weight, penalty, banned_targets in itertools.product(
+            {baseline.high_value_targets, ()},
+            (0.3, 0.5, 0.7, 1.0),
+            (1.5, 2.0, 3.0),
+            (0.0, 0.35, 0.7, 1.4),
+            {baseline.banned_targets, ()},
+        )
+    ]
+
+
+def sample_configurations(baseline: Configuration, count: int, rng: random.Random) -> List[Configuration]:
+    stations = [x.value for x in StationCode]
+    return [
+        Configuration(
+            high_value_targets=tuple(sorted(rng.sample(stations, rng.randint(0, 6)))),
+            high_value_discount=round(rng.uniform(0.2, 1.0), 3),
+            high_value_weight=round(rng.uniform(1.0, 4.0), 3),
+            capture_count_penalty=round(rng.uniform(0.0, 2.0), 3),
+            banned_targets=tuple(sorted(x for x in baseline.banned_targets if rng.random() < 0.5)),
+        )
+        for _ in range(count)
+    ]
+
+
+def summarise(values: Sequence[float]) -> Dict[str, float]:
+    mean = statistics.mean(values)
+    stdev = statistics.stdev(values) if len(values) > 1 else 0.0
+    # Normal approximation to the 95% confidence interval on the mean
+    half_width = 1.96 * stdev / math.sqrt(len(values))
+    return {
+        'mean': mean,
+        'stdev': stdev,
+        'ci_low': mean - half_width,
+        'ci_high': mean + half_width,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tune strategy weights over simulated matches")
+    parser.add_argument('--matches', type=int, default=200, help="matches per configuration")
+    parser.add_argument('--sample', type=int, help="evaluate this many random configurations instead of the grid")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=25, help="matches per worker task")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', default='tuning_results.json')
+    args = parser.parse_args()
+
+    baseline = current_configuration()
+    if args.sample is None:
+        configurations = grid_configurations(baseline)
+    else:
+        configurations = sample_configurations(baseline, args.sample, random.Random(args.seed))
+    if baseline not in configurations:
+        configurations.insert(0, baseline)
+
+    # Every configuration plays the same seeds, so comparisons between them
+    # aren't swamped by match-to-match variation
+    seeds = list(range(args.seed, args.seed + args.matches))
+    chunks = [seeds[i:i + args.chunk] for i in range(0, len(seeds), args.chunk)]
+    print(f"Evaluating {len(configurations)} configurations over {len(seeds)} matches each on {args.workers} workers")
+
+    outcomes: Dict[Configuration, List[Tuple[int, int]]] = {x: [] for x in configurations}
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(evaluate, configuration, chunk): configuration
+            for configuration in configurations
+            for chunk in chunks
+        }
+        for completed, future in enumerate(as_completed(futures), 1):
+            outcomes[futures[future]].extend(future.result())
+            if completed % 50 == 0 or completed == len(futures):
+                print(f"  {completed}/{len(futures)} tasks complete")
+
+    report = []
+    for configuration, results in outcomes.items():
+        report.append({
+            'configuration': dataclasses.asdict(configuration),
+            'baseline': configuration == baseline,
+            'matches': len(results),
+            'score': summarise([score for score, _ in results]),
+            'captures': summarise([captures for _, captures in results]),
+        })
+    report.sort(key=lambda x: x['score']['mean'], reverse=True)
+
+    for entry in report[:args.top]:
+        score = entry['score']
+        marker = ' (baseline)' if entry['baseline'] else ''
+        print(f"{score['mean']:.2f} [{score['ci_low']:.2f}, {score['ci_high']:.2f}] captures {entry['captures']['mean']:.2f}: {entry['configuration']}{marker}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report[:args.top], f, indent=2)
+    print(f"Wrote best {min(args.top, len(report))} configurations to {args.output}")